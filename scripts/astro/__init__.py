@@ -0,0 +1,7 @@
+"""
+Shared astronomy helpers for the Cherbourg scripts.
+
+The modules of this package are imported by the scripts of the parent
+``scripts`` folder (``sun_calculations.py``, ``moon_calculations.py``, ...),
+which are run from the folder holding the ephemeris files.
+"""
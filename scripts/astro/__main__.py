@@ -0,0 +1,44 @@
+"""
+Command line entry point, to run from the folder holding the ephemeris files::
+
+    python -m astro sun        rapport du Soleil
+    python -m astro moon       rapport de la Lune
+    python -m astro eclipses   catalogue des éclipses de Lune 1900-2050
+    python -m astro apsides    prochains périhélies et aphélies des planètes
+    python -m astro excerpt    extrait des éphémérides autour de l'année en cours
+    python -m astro iers       téléchargement des paramètres d'orientation de la Terre
+    python -m astro vsop       précision et coût des séries VSOP87 tronquées
+    python -m astro backends   durée et accord des calculs selon la bibliothèque
+    python -m astro daemon     service résident (voir astro/daemon.py)
+    python -m astro images     images du tableau de bord (voir astro/render.py)
+
+The command module is imported only when it is run.
+"""
+import importlib
+import sys
+
+COMMANDS = {
+    'sun': 'astro.sun',
+    'moon': 'astro.moon',
+    'eclipses': 'astro.eclipses',
+    'apsides': 'astro.apsides',
+    'excerpt': 'astro.excerpt',
+    'iers': 'astro.earth_orientation',
+    'vsop': 'astro.vsop',
+    'backends': 'astro.backends',
+    'daemon': 'astro.daemon',
+    'images': 'astro.render',
+}
+
+
+def main(argv=None):
+    argv = sys.argv[1:] if argv is None else argv
+    if not argv or argv[0] not in COMMANDS:
+        print(__doc__.strip(), file=sys.stderr)
+        return 2
+    module = importlib.import_module(COMMANDS[argv[0]])
+    return module.main(argv[1:])
+
+
+if __name__ == '__main__':
+    sys.exit(main())
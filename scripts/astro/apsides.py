@@ -0,0 +1,187 @@
+"""
+Perihelia and aphelia of the planets.
+
+The heliocentric distance r of a planet comes from the VSOP87 series of
+``astro.vsop`` (all terms), valid over any span, without ephemeris file. Its
+derivative, the radial velocity, is sampled on a grid whose step is sized to
+the orbital period (PERIOD_DAYS / SAMPLES_PER_ORBIT, at most MAX_STEP_DAYS);
+each sign change brackets an extremum, refined by bisection of all the
+brackets at once down to TOLERANCE_DAYS.
+
+The Sun's own motion around the barycenter, mostly due to Jupiter, adds
+small wiggles to the distance of the outer planets, hence extra local
+extrema around their apsides. Only the perihelia closer than the mean
+distance and lowest within a quarter of an orbit are kept, and likewise
+for the aphelia, which gives one of each per orbit.
+
+The apsides found are kept in ``cache/apsides.npz`` with the span searched
+for each planet; like the eclipse catalog, a query outside that span only
+searches the missing part. They move once per orbit, so the file is read
+far more often than written::
+
+    python -m astro apsides
+"""
+import argparse
+import os
+import time
+
+import numpy as np
+
+from astro import vsop
+from astro.settings import cache_path
+
+# Périodes sidérales (jours)
+PERIOD_DAYS = {'mercury': 87.969, 'venus': 224.701, 'earth': 365.256, 'mars': 686.980, 'jupiter': 4332.59,
+               'saturn': 10759.22, 'uranus': 30688.5, 'neptune': 60182.0}
+SAMPLES_PER_ORBIT = 32
+MAX_STEP_DAYS = 100.0  # assez fin pour les ondulations de 12 ans dues à Jupiter
+TOLERANCE_DAYS = 1e-5
+DERIVATIVE_STEP_DAYS = 0.01
+VERSION = 1
+
+PERIHELION, APHELION = 0, 1
+
+
+def distance_au(name, tt):
+    """Heliocentric distance (au) of the planet at the TT Julian dates tt."""
+    return np.linalg.norm(vsop.series().heliocentric([name], tt)[0], axis=0)
+
+
+def radial_velocity(name, tt):
+    """Derivative of the heliocentric distance (au/day) at the TT Julian dates tt."""
+    tt = np.asarray(tt, dtype=float)
+    h = DERIVATIVE_STEP_DAYS
+    r = distance_au(name, np.concatenate([tt - h, tt + h]))
+    return (r[len(tt):] - r[:len(tt)]) / (2 * h)
+
+
+def find_apsides(name, tt0, tt1):
+    """
+    Apsides of the planet between the TT Julian dates tt0 and tt1.
+
+    Returns tt, kinds (PERIHELION or APHELION) and distances (au), sorted by
+    time.
+    """
+    period = PERIOD_DAYS[name]
+    step = min(period / SAMPLES_PER_ORBIT, MAX_STEP_DAYS)
+    # Marge d'un quart d'orbite pour départager les extrema proches des bornes
+    margin = period / 4
+    grid = np.arange(tt0 - margin, tt1 + margin + step, step)
+    rv = radial_velocity(name, grid)
+    i = np.flatnonzero(np.sign(rv[:-1]) != np.sign(rv[1:]))
+    lo, hi = grid[i], grid[i + 1]
+    rising = rv[i] < rv[i + 1]  # la distance passe par un minimum
+
+    # Bisection de tous les intervalles à la fois
+    while len(lo) and np.max(hi - lo) > TOLERANCE_DAYS:
+        mid = (lo + hi) / 2
+        before = (radial_velocity(name, mid) < 0) == rising
+        lo, hi = np.where(before, mid, lo), np.where(before, hi, mid)
+    tt = (lo + hi) / 2
+    r = distance_au(name, tt)
+    kinds = np.where(rising, PERIHELION, APHELION)
+
+    keep = np.zeros(len(tt), dtype=bool)
+    mean_r = distance_au(name, grid).mean()
+    for kind, sign in ((PERIHELION, 1.0), (APHELION, -1.0)):
+        candidates = np.flatnonzero((kinds == kind) & (sign * (r - mean_r) < 0))
+        for j in candidates:
+            near = candidates[np.abs(tt[candidates] - tt[j]) < margin]
+            keep[j] = sign * r[j] <= np.min(sign * r[near])
+    keep &= (tt >= tt0) & (tt < tt1)
+    return tt[keep], kinds[keep], r[keep]
+
+
+class ApsisCatalog:
+    """
+    Parameters
+    ----------
+    path : .npz file, by default apsides.npz in the cache folder
+    """
+
+    def __init__(self, path=None):
+        self.path = path or cache_path('apsides.npz')
+        self.key = repr((VERSION, TOLERANCE_DAYS, vsop.TABLE_VERSION))
+        self._data = None
+
+    def _load(self):
+        if self._data is None:
+            data = None
+            try:
+                with np.load(self.path) as f:
+                    if str(f['key']) == self.key:
+                        data = {name: f[name] for name in f.files}
+            except (OSError, KeyError, ValueError):
+                pass
+            self._data = data or {'key': np.array(self.key)}
+        return self._data
+
+    def _save(self):
+        tmp = f'{self.path}.{os.getpid()}.tmp'
+        with open(tmp, 'wb') as f:
+            np.savez_compressed(f, **self._data)
+        os.replace(tmp, self.path)
+
+    def ensure(self, name, tt0, tt1):
+        """Extends the catalog of the planet so that it covers [tt0, tt1]."""
+        data = self._load()
+        lo, hi = data.get(f'{name}_coverage', (np.nan, np.nan))
+        # Étendue agrandie d'au moins une orbite, pour ne pas chercher à
+        # nouveau à chaque appel quand la date avance
+        period = PERIOD_DAYS[name]
+        if np.isnan(lo):
+            pieces = [(tt0, tt1 + period)]
+            lo, hi = tt0, tt1 + period
+        else:
+            pieces = []
+            if tt0 < lo:
+                pieces.append((min(tt0, lo - period), lo))
+                lo = min(tt0, lo - period)
+            if tt1 > hi:
+                pieces.append((hi, max(tt1, hi + period)))
+                hi = max(tt1, hi + period)
+        if not pieces:
+            return
+
+        found = [find_apsides(name, a, b) for a, b in pieces]
+        columns = []
+        for k, column in enumerate(('tt', 'kinds', 'distances')):
+            old = data.get(f'{name}_{column}', np.empty(0, dtype=found[0][k].dtype))
+            columns.append(np.concatenate([old] + [f[k] for f in found]))
+        order = np.argsort(columns[0], kind='stable')
+        for column, values in zip(('tt', 'kinds', 'distances'), columns):
+            data[f'{name}_{column}'] = values[order]
+        data[f'{name}_coverage'] = np.array([lo, hi])
+        self._save()
+
+    def between(self, name, tt0, tt1):
+        """Returns tt, kinds, distances of the apsides of the planet in [tt0, tt1)."""
+        self.ensure(name, tt0, tt1)
+        data = self._data
+        tt = data[f'{name}_tt']
+        index = slice(np.searchsorted(tt, tt0, side='left'), np.searchsorted(tt, tt1, side='left'))
+        return tt[index], data[f'{name}_kinds'][index], data[f'{name}_distances'][index]
+
+    def next_after(self, name, tt):
+        """Returns the TT Julian dates of the next perihelion and of the next aphelion after tt."""
+        period = PERIOD_DAYS[name]
+        times, kinds, _ = self.between(name, tt, tt + 1.25 * period)
+        times, kinds = times[times > tt], kinds[times > tt]
+        return times[kinds == PERIHELION][0], times[kinds == APHELION][0]
+
+
+def main(argv=None):
+    from astro import resources
+
+    parser = argparse.ArgumentParser(prog='python -m astro apsides',
+                                     description='Prochains périhélies et aphélies des planètes.')
+    parser.parse_args(argv)
+    ts = resources.timescale()
+    catalog = resources.apsis_catalog()
+    now = ts.now()
+    for name in PERIOD_DAYS:
+        start = time.perf_counter()
+        perihelion, aphelion = catalog.next_after(name, float(now.tt))
+        duration = (time.perf_counter() - start) * 1000
+        print(f"{name:8} périhélie {ts.tt_jd(perihelion).utc_strftime('%Y-%m-%d %H:%M')}"
+              f"  aphélie {ts.tt_jd(aphelion).utc_strftime('%Y-%m-%d %H:%M')}  ({duration:.1f} ms)")
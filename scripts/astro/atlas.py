@@ -0,0 +1,114 @@
+"""
+Atlas of pre-rendered phase discs.
+
+The aspect of a disc only depends on its phase angle, its sunlit side and its
+apparent size, which all change slowly. ``PhaseAtlas`` holds the sprites of
+one disc color and one radius, drawn once by ``raster.disc_sprite`` for every
+PHASE_STEP of phase angle, lit from the left (the other side is the mirror
+image). Each atlas is a compressed ``.npz`` file of the cache folder, one
+array per frame, so that only the frame used is read back; it is rebuilt
+when the colors or the line width it was drawn with change.
+
+``AtlasPhaseFigure`` composes the phase images from the frame of the nearest
+phase in the smallest atlas at least as large as the disc, scaled down to
+the disc's size, then writes the texts. Discs larger than the largest atlas,
+like the Moon's, are drawn directly: a frame of that size takes longer to
+store and read back than to draw, and only when the image changes.
+"""
+import math
+import os
+
+import numpy as np
+from PIL import Image
+
+from astro.raster import RasterPhaseFigure, disc_sprite
+from astro.settings import cache_path
+
+PHASE_STEP = 1  # degré
+# Rayons des disques pré-rendus, en pixels, espacés d'un facteur √2 : un disque
+# est réduit au plus de 29 %. Au-delà de 181 px, un atlas pèse plusieurs Mo et
+# se construit en plusieurs dizaines de secondes
+RADII = tuple(round(16 * 2 ** (k / 2)) for k in range(8))
+# Le bord est dessiné un peu plus épais dans l'atlas pour garder, après
+# réduction, une épaisseur à ±19 % de celle demandée
+LIMB_SCALE = 2 ** 0.25
+VERSION = 1  # à changer si le dessin de disc_sprite change
+
+
+class PhaseAtlas:
+    """
+    Parameters
+    ----------
+    color : color of the lit part of the disc
+    dark_color : color of the unlit half
+    linewidth_px : width of the limb, in pixels
+    radius : radius of the disc in the frames, in pixels
+    path : .npz file, by default phase_atlas_<color>_<radius>.npz in the cache folder
+    """
+
+    def __init__(self, color, dark_color, linewidth_px, radius, path=None):
+        self.color = color
+        self.dark_color = dark_color
+        self.linewidth_px = linewidth_px
+        self.radius = radius
+        name = color.lstrip('#').replace(' ', '_')
+        self.path = path or cache_path(f'phase_atlas_{name}_{radius}.npz')
+        self.theme = repr((VERSION, PHASE_STEP, color, dark_color, round(linewidth_px, 3), radius))
+        self._frames = None
+
+    def build(self):
+        """Draws every frame and saves the atlas."""
+        frames = {}
+        for phase in range(0, 181, PHASE_STEP):
+            b = self.radius * math.cos(math.radians(phase))
+            terminator_color = self.color if phase < 90 else 'black'
+            frames[f'phase_{phase:03d}'] = disc_sprite(self.radius, b, True, self.color, terminator_color,
+                                                       self.dark_color, self.linewidth_px * LIMB_SCALE)
+        tmp = f'{self.path}.{os.getpid()}.tmp'
+        with open(tmp, 'wb') as f:
+            np.savez_compressed(f, theme=np.array(self.theme), **frames)
+        os.replace(tmp, self.path)
+
+    def _load(self):
+        if self._frames is None:
+            frames = None
+            if os.path.exists(self.path):
+                frames = np.load(self.path)
+                if str(frames['theme']) != self.theme:
+                    frames.close()
+                    frames = None
+            if frames is None:
+                self.build()
+                frames = np.load(self.path)
+            self._frames = frames
+        return self._frames
+
+    def frame(self, phase, left=True):
+        """RGBA sprite (uint8) of the frame nearest to the phase angle (degrees)."""
+        step = min(180, max(0, PHASE_STEP * round(phase / PHASE_STEP)))
+        frame = self._load()[f'phase_{step:03d}']
+        return frame if left else frame[:, ::-1]
+
+
+class AtlasPhaseFigure(RasterPhaseFigure):
+    """``RasterPhaseFigure`` whose discs come from the atlases; larger discs are drawn."""
+
+    def __init__(self, size, dark_color, linewidth, font, background):
+        super().__init__(size, dark_color, linewidth, font, background)
+        self.atlases = {}
+
+    def sprite(self, radius_px, b_px, left, color, terminator_color):
+        bucket = next((radius for radius in RADII if radius >= radius_px), None)
+        if bucket is None:
+            return super().sprite(radius_px, b_px, left, color, terminator_color)
+        key = color, bucket
+        if key not in self.atlases:
+            self.atlases[key] = PhaseAtlas(color, self.dark_color, self.linewidth, bucket)
+        phase = math.degrees(math.acos(max(-1.0, min(1.0, b_px / radius_px))))
+        sprite = Image.fromarray(self.atlases[key].frame(phase, left), 'RGBA')
+        # Réduction à la taille du disque, en couleurs prémultipliées pour ne
+        # pas assombrir le bord
+        size = max(1, round(sprite.width * radius_px / bucket))
+        sprite = sprite.convert('RGBa').resize((size, size), Image.LANCZOS).convert('RGBA')
+        corner = round(self.size / 2 - size / 2)
+        return sprite, corner
@@ -0,0 +1,358 @@
+"""
+One interface over the three astronomy libraries used by the repository.
+
+The same quantities are computed with Skyfield (``astro`` package), astropy
+and astroplan (``new_*_test.py``) and astronomy-engine (the Node-RED
+template). A ``Backend`` answers four questions for a body given by its
+lower-case name ('sun', 'moon', 'mercury' ... 'pluto') at a Skyfield time:
+
+- ``position``: apparent right ascension and declination of date, distance,
+  and airless altitude and azimuth seen by the observer of the settings;
+- ``rise_set``: next rise and set within two days, as UTC datetimes;
+- ``phase``: phase angle and illuminated fraction;
+- ``lunar_eclipse``: peak (UTC datetime) and kind of the next lunar eclipse.
+
+``SkyfieldBackend``, ``AstropyBackend`` and ``AstronomyEngineBackend`` adapt
+each library; a library is imported only when its backend is first used.
+The backend of each quantity is chosen per call with ``backend=``, or for
+the whole deployment with the ``ASTRO_BACKENDS`` environment variable, e.g.
+``position=astronomy-engine,rise_set=skyfield`` (Skyfield by default).
+
+``python -m astro backends`` times every quantity with every backend and
+prints its agreement with Skyfield, to pick the fastest acceptable one.
+"""
+import argparse
+import collections
+import datetime as dt
+import functools
+import time
+
+import numpy as np
+
+from astro import resources, settings
+
+QUANTITIES = ('position', 'rise_set', 'phase', 'lunar_eclipse')
+BODIES = ('sun', 'moon', 'mercury', 'venus', 'mars', 'jupiter', 'saturn', 'uranus', 'neptune', 'pluto')
+RISE_SET_DAYS = 2.0
+
+Position = collections.namedtuple(
+    'Position', 'right_ascension declination distance_au altitude_degrees azimuth_degrees')
+
+
+def _phase_angle(body_au, sun_au):
+    """Angle Sun - body - observer in degrees, from the positions of the body and of the Sun seen by the observer."""
+    to_sun = np.asarray(sun_au) - np.asarray(body_au)
+    to_observer = -np.asarray(body_au)
+    cos_angle = np.dot(to_sun, to_observer) / np.linalg.norm(to_sun) / np.linalg.norm(to_observer)
+    return float(np.degrees(np.arccos(np.clip(cos_angle, -1.0, 1.0))))
+
+
+class Backend:
+    """Interface of the backends; every method takes a body name and a Skyfield time."""
+
+    name = None
+
+    def position(self, body, t):
+        """Returns a Position."""
+        raise NotImplementedError
+
+    def rise_set(self, body, t):
+        """Returns the next rise and set (UTC datetimes, None if there is none within RISE_SET_DAYS)."""
+        raise NotImplementedError
+
+    def phase(self, body, t):
+        """Returns phase angle (degrees) and illuminated fraction (0-1)."""
+        raise NotImplementedError
+
+    def lunar_eclipse(self, t):
+        """
+        Returns peak (UTC datetime) and kind ('Penumbral', 'Partial', 'Total')
+        of the next lunar eclipse, (None, None) if there is none within reach
+        of the backend.
+        """
+        raise NotImplementedError
+
+    @classmethod
+    def implements(cls, quantity):
+        """True if the backend computes quantity, rather than raising NotImplementedError."""
+        return getattr(cls, quantity) is not getattr(Backend, quantity)
+
+
+class SkyfieldBackend(Backend):
+    """DE421 through Skyfield, with the resources of the ``astro`` package."""
+
+    name = 'skyfield'
+
+    def __init__(self):
+        from astro.planet_batch import PLANETS
+        self.names = {'sun': 'sun', 'moon': 'moon', **PLANETS}
+
+    def position(self, body, t):
+        apparent = resources.observer().at(t).observe(resources.ephemeris()[self.names[body]]).apparent()
+        ra, dec, distance = apparent.radec('date')
+        alt, az, _ = apparent.altaz()
+        return Position(ra.hours, dec.degrees, distance.au, alt.degrees, az.degrees)
+
+    def rise_set(self, body, t):
+        from skyfield import almanac
+
+        target = resources.ephemeris()[self.names[body]]
+        end = t + RISE_SET_DAYS
+        events = []
+        for find in (almanac.find_risings, almanac.find_settings):
+            times, found = find(resources.observer(), target, t, end)
+            times = times[found]
+            events.append(times[0].utc_datetime() if len(times) else None)
+        return tuple(events)
+
+    def phase(self, body, t):
+        from skyfield import almanac
+
+        eph = resources.ephemeris()
+        angle = almanac.phase_angle(eph, self.names[body], t).degrees
+        return float(angle), (1 + np.cos(np.radians(angle))) / 2
+
+    def lunar_eclipse(self, t):
+        from skyfield import eclipselib
+
+        eclipse = resources.eclipse_catalog().next_after(t)
+        if eclipse is None:
+            # Au-delà de l'éphéméride : pas d'éclipse connue
+            return None, None
+        when, kind, _ = eclipse
+        return when.utc_datetime(), eclipselib.LUNAR_ECLIPSES[kind]
+
+
+class AstronomyEngineBackend(Backend):
+    """astronomy-engine (VSOP87 and its own lunar series), with the Delta T of Skyfield."""
+
+    name = 'astronomy-engine'
+
+    def __init__(self):
+        import astronomy
+        from astro.earth_orientation import configure_astronomy_engine
+
+        configure_astronomy_engine(resources.timescale())
+        self.astronomy = astronomy
+        self.observer = astronomy.Observer(settings.LATITUDE, settings.LONGITUDE, settings.ELEVATION)
+
+    def _time(self, t):
+        return self.astronomy.Time.FromTerrestrialTime(t.tt - 2451545.0)
+
+    def _body(self, body):
+        return getattr(self.astronomy.Body, body.capitalize())
+
+    @staticmethod
+    def _datetime(time):
+        return time.Utc().replace(tzinfo=dt.timezone.utc) if time is not None else None
+
+    def position(self, body, t):
+        astronomy = self.astronomy
+        time = self._time(t)
+        equator = astronomy.Equator(self._body(body), time, self.observer, True, True)
+        horizon = astronomy.Horizon(time, self.observer, equator.ra, equator.dec, astronomy.Refraction.Airless)
+        return Position(equator.ra, equator.dec, equator.dist, horizon.altitude, horizon.azimuth)
+
+    def rise_set(self, body, t):
+        astronomy = self.astronomy
+        time = self._time(t)
+        return tuple(self._datetime(astronomy.SearchRiseSet(self._body(body), self.observer, direction, time,
+                                                           RISE_SET_DAYS))
+                     for direction in (astronomy.Direction.Rise, astronomy.Direction.Set))
+
+    def phase(self, body, t):
+        illumination = self.astronomy.Illumination(self._body(body), self._time(t))
+        return illumination.phase_angle, illumination.phase_fraction
+
+    def lunar_eclipse(self, t):
+        eclipse = self.astronomy.SearchLunarEclipse(self._time(t))
+        return self._datetime(eclipse.peak), eclipse.kind.name
+
+
+class AstropyBackend(Backend):
+    """
+    astropy, with its built-in ephemeris, and astroplan for rise and set.
+    astropy has no eclipse search.
+    """
+
+    name = 'astropy'
+
+    # Hauteur du centre au lever : réfraction (34′) et demi-diamètre
+    HORIZON_DEGREES = {'sun': -0.8333, 'moon': -0.8}
+
+    def __init__(self):
+        import astropy.units as u
+        from astropy import coordinates
+        from astropy.time import Time
+        from astro.earth_orientation import configure_astropy
+
+        configure_astropy()
+        self.u = u
+        self.coordinates = coordinates
+        self.Time = Time
+        self.location = coordinates.EarthLocation(lat=settings.LATITUDE * u.deg, lon=settings.LONGITUDE * u.deg,
+                                                  height=settings.ELEVATION * u.m)
+
+    def _time(self, t):
+        return self.Time(t.tt, format='jd', scale='tt')
+
+    def _body(self, body, time):
+        return self.coordinates.get_body(body, time, location=self.location)
+
+    def position(self, body, t):
+        coordinates, u = self.coordinates, self.u
+        time = self._time(t)
+        coord = self._body(body, time)
+        of_date = coord.transform_to(coordinates.TETE(obstime=time, location=self.location))
+        altaz = coord.transform_to(coordinates.AltAz(obstime=time, location=self.location, pressure=0 * u.hPa))
+        return Position(of_date.ra.hour, of_date.dec.degree, coord.distance.to(u.au).value,
+                        altaz.alt.degree, altaz.az.degree)
+
+    def rise_set(self, body, t):
+        from astroplan import FixedTarget, Observer
+
+        time = self._time(t)
+        observer = Observer(location=self.location)
+        horizon = self.HORIZON_DEGREES.get(body, -0.5667) * self.u.deg
+        end = time + RISE_SET_DAYS * self.u.day
+        if body in ('sun', 'moon'):
+            # astroplan suit le déplacement du Soleil et de la Lune pendant la recherche
+            searches = (getattr(observer, f'{body}_rise_time'), getattr(observer, f'{body}_set_time'))
+        else:
+            # Les planètes sont prises fixes à leur position de l'instant t
+            target = FixedTarget(self._body(body, time))
+            searches = (functools.partial(observer.target_rise_time, target=target),
+                        functools.partial(observer.target_set_time, target=target))
+        events = []
+        for search in searches:
+            found = search(time, which='next', horizon=horizon)
+            valid = not np.ma.is_masked(found.value) and found < end
+            events.append(found.to_datetime(timezone=dt.timezone.utc) if valid else None)
+        return tuple(events)
+
+    def phase(self, body, t):
+        u = self.u
+        time = self._time(t)
+        body_au = self._body(body, time).cartesian.xyz.to(u.au).value
+        sun_au = self._body('sun', time).cartesian.xyz.to(u.au).value
+        angle = _phase_angle(body_au, sun_au)
+        return angle, (1 + np.cos(np.radians(angle))) / 2
+
+
+BACKENDS = {backend.name: backend for backend in (SkyfieldBackend, AstropyBackend, AstronomyEngineBackend)}
+
+
+def _configured():
+    """Backend of each quantity, from ASTRO_BACKENDS."""
+    choice = dict.fromkeys(QUANTITIES, 'skyfield')
+    for item in filter(None, settings.BACKENDS.split(',')):
+        quantity, name = item.split('=')
+        if quantity not in QUANTITIES or name not in BACKENDS:
+            raise ValueError(f'ASTRO_BACKENDS: unknown quantity or backend in {item!r}')
+        if not BACKENDS[name].implements(quantity):
+            raise ValueError(f'ASTRO_BACKENDS: {name} does not compute {quantity}')
+        choice[quantity] = name
+    return choice
+
+
+@functools.lru_cache(maxsize=None)
+def get(name):
+    """Shared instance of the backend named name."""
+    return BACKENDS[name]()
+
+
+def backend_for(quantity, backend=None):
+    """Backend to use for quantity: the one named, else the one of the settings."""
+    name = backend or _configured()[quantity]
+    if not BACKENDS[name].implements(quantity):
+        raise ValueError(f'{name} does not compute {quantity}')
+    return get(name)
+
+
+def position(body, t, backend=None):
+    return backend_for('position', backend).position(body, t)
+
+
+def rise_set(body, t, backend=None):
+    return backend_for('rise_set', backend).rise_set(body, t)
+
+
+def phase(body, t, backend=None):
+    return backend_for('phase', backend).phase(body, t)
+
+
+def lunar_eclipse(t, backend=None):
+    return backend_for('lunar_eclipse', backend).lunar_eclipse(t)
+
+
+def _angle(ra1, dec1, ra2, dec2):
+    """Separation in arcseconds between two directions (hours, degrees)."""
+    ra1, dec1, ra2, dec2 = np.radians(ra1 * 15), np.radians(dec1), np.radians(ra2 * 15), np.radians(dec2)
+    cos_angle = np.sin(dec1) * np.sin(dec2) + np.cos(dec1) * np.cos(dec2) * np.cos(ra1 - ra2)
+    return float(np.degrees(np.arccos(np.clip(cos_angle, -1.0, 1.0))) * 3600)
+
+
+def _seconds(a, b):
+    if a is None or b is None:
+        return 0.0 if a is b else np.inf
+    return abs((a - b).total_seconds())
+
+
+def _difference(quantity, value, reference):
+    """Difference between a result and the reference, as text."""
+    if quantity == 'position':
+        radec = _angle(value.right_ascension, value.declination, reference.right_ascension, reference.declination)
+        altaz = _angle(value.azimuth_degrees / 15, value.altitude_degrees,
+                       reference.azimuth_degrees / 15, reference.altitude_degrees)
+        return f'{radec:.3g}″ / {altaz:.3g}″'
+    if quantity == 'rise_set':
+        return f'{max(_seconds(a, b) for a, b in zip(value, reference)):.3g} s'
+    if quantity == 'phase':
+        return f'{abs(value[0] - reference[0]):.3g}°'
+    return f'{_seconds(value[0], reference[0]):.3g} s' if value[1] == reference[1] else f'{value[1]} ≠ {reference[1]}'
+
+
+def _call(backend, quantity, body, t):
+    if quantity == 'lunar_eclipse':
+        return backend.lunar_eclipse(t)
+    return getattr(backend, quantity)(body, t)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog='python -m astro backends',
+                                     description='Durée et accord des calculs selon la bibliothèque.')
+    parser.add_argument('--bodies', nargs='+', default=['sun', 'moon', 'mars', 'jupiter'], choices=BODIES)
+    parser.add_argument('--repeat', type=int, default=5, help='appels mesurés par calcul')
+    args = parser.parse_args(argv)
+
+    t = resources.timescale().now()
+    available = {}
+    for name in BACKENDS:
+        try:
+            available[name] = get(name)
+        except ImportError as e:
+            print(f'{name} : indisponible ({e.name} manquant)')
+
+    # Écart des positions : ascension droite et déclinaison / hauteur et azimut
+    print(f"{'calcul':14} {'astre':8} {'bibliothèque':17} {'durée (ms)':>11} {'écart à Skyfield':>17}")
+    for quantity in QUANTITIES:
+        bodies = {'lunar_eclipse': ['moon'], 'phase': [body for body in args.bodies if body != 'sun']}
+        for body in bodies.get(quantity, args.bodies):
+            reference = None
+            for name, backend in available.items():
+                if not backend.implements(quantity):
+                    print(f'{quantity:14} {body:8} {name:17} {"—":>11}')
+                    continue
+                value = _call(backend, quantity, body, t)  # premier appel : chargements
+                start = time.perf_counter()
+                for _ in range(args.repeat):
+                    _call(backend, quantity, body, t)
+                duration = (time.perf_counter() - start) / args.repeat * 1000
+                if name == 'skyfield':
+                    reference = value
+                    agreement = 'référence'
+                elif reference is None:
+                    agreement = ''
+                else:
+                    agreement = _difference(quantity, value, reference)
+                print(f'{quantity:14} {body:8} {name:17} {duration:11.2f} {agreement:>17}')
@@ -0,0 +1,89 @@
+"""
+Constellation lookup for the Sun, the Moon and the planets.
+
+The boundary map is loaded once (see ``resources.constellation_map``) and
+queried with arrays, so the constellations of every body are found in a
+single call. For the current constellation of a body, the times at which
+it crosses a boundary are searched once per calendar year and stored in the
+event cache; until the next crossing, the answer is a binary search in
+those times.
+"""
+import functools
+
+import numpy as np
+from skyfield.api import load_constellation_names, position_of_radec
+
+from astro import resources
+
+BODIES = ['sun', 'moon', 'mercury', 'venus', 'mars', 'jupiter barycenter',
+          'saturn barycenter', 'uranus barycenter', 'neptune barycenter',
+          'pluto barycenter']  # noms reconnus par Skyfield
+
+# Pas de recherche des franchissements de frontières, en jours
+STEP_DAYS = {'sun': 1.0, 'moon': 1.0 / 24.0}
+DEFAULT_STEP_DAYS = 0.5
+
+ABBREVIATIONS = np.array(sorted(abbreviation for abbreviation, _ in load_constellation_names()))
+
+
+def constellation_of(ra_hours, dec_degrees):
+    """Returns the constellation abbreviation(s) for J2000 RA (hours) and Dec (degrees), scalars or arrays."""
+    return resources.constellation_map()(position_of_radec(ra_hours, dec_degrees))
+
+
+def constellations_of(snapshot, bodies=BODIES):
+    """Returns {body: abbreviation} for the bodies of a snapshot, with a single map lookup."""
+    ra_hours = np.empty(len(bodies))
+    dec_degrees = np.empty(len(bodies))
+    for i, name in enumerate(bodies):
+        ra, dec, _ = snapshot.radec(name)
+        ra_hours[i], dec_degrees[i] = ra.hours, dec.degrees
+    return dict(zip(bodies, constellation_of(ra_hours, dec_degrees)))
+
+
+def _constellation_index(body):
+    """Returns a function of time giving the index (in ABBREVIATIONS) of the body's constellation."""
+    observer = resources.observer()
+    target = resources.ephemeris()[body]
+    constellation_at = resources.constellation_map()
+
+    def index(t):
+        apparent = observer.at(t).observe(target).apparent()
+        return np.searchsorted(ABBREVIATIONS, constellation_at(apparent))
+    index.step_days = STEP_DAYS.get(body, DEFAULT_STEP_DAYS)
+    return index
+
+
+@functools.lru_cache(maxsize=None)
+def constellation_crossings(body, year):
+    """
+    Returns (tt, abbreviations, initial) for one calendar year: the TT dates
+    of the boundary crossings, the constellation entered at each crossing,
+    and the constellation on January 1st.
+    """
+    ts = resources.timescale()
+    t0, t1 = ts.utc(year, 1, 1), ts.utc(year + 1, 1, 1)
+    index = _constellation_index(body)
+    times, events = resources.event_cache().find_discrete(
+        'constellation', body, resources.location(), resources.ephemeris(), t0, t1,
+        lambda: index)
+    initial = ABBREVIATIONS[index(t0)]
+    return times.tt, ABBREVIATIONS[events], initial
+
+
+def current_constellation(body, t):
+    """Constellation of the body at t, looked up among the crossings of its year."""
+    tt, abbreviations, initial = constellation_crossings(body, t.utc_datetime().year)
+    i = np.searchsorted(tt, t.tt, side='right')
+    return abbreviations[i - 1] if i else initial
+
+
+def next_crossing(body, t):
+    """Returns (time, constellation entered) of the body's next boundary crossing after t."""
+    year = t.utc_datetime().year
+    for y in (year, year + 1):
+        tt, abbreviations, _ = constellation_crossings(body, y)
+        i = np.searchsorted(tt, t.tt, side='right')
+        if i < len(tt):
+            return resources.timescale().tt_jd(tt[i]), abbreviations[i]
+    return None
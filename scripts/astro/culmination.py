@@ -0,0 +1,67 @@
+"""
+Culmination and anti-culmination of a body for a given observer.
+
+The highest and lowest altitudes of a body over a time window are found
+with Skyfield's extrema search: the altitude is sampled once as a
+vectorized ``Time`` array, then each bracketed extremum is refined down
+to about one second, instead of evaluating the position minute by minute.
+With a ``PositionCache``, the altitudes come from its per-day fits.
+"""
+import numpy as np
+from skyfield.searchlib import find_maxima, find_minima
+
+STEP_DAYS = 1.0 / 24.0  # pas d'échantillonnage initial : 1 heure
+
+
+def _altaz(observer, body, t, positions):
+    if positions is not None:
+        return positions.altaz(body, t)
+    return observer.at(t).observe(body).apparent().altaz()
+
+
+def _altitude_function(observer, body, positions=None):
+    """Returns a vectorized function giving the apparent altitude (degrees)."""
+    def altitude(t):
+        alt, _, _ = _altaz(observer, body, t, positions)
+        return alt.degrees
+    altitude.step_days = STEP_DAYS
+    return altitude
+
+
+def altitude_extrema(observer, body, t, days=1.0, positions=None):
+    """
+    Parameters
+    ----------
+    observer : Skyfield vector sum (earth + topos)
+    body : Skyfield body, e.g. eph['sun']
+    t : Skyfield time, start of the window
+    days : length of the window in days
+    positions : PositionCache of the same observer, or None
+
+    Returns ((min_time, min_azimuth, min_altitude),
+             (max_time, max_azimuth, max_altitude))
+    with UTC datetimes and angles in degrees.
+    """
+    ts = t.ts
+    t_end = ts.tt_jd(t.tt + days)
+    altitude = _altitude_function(observer, body, positions)
+
+    t_max, alt_max = find_maxima(t, t_end, altitude)
+    t_min, alt_min = find_minima(t, t_end, altitude)
+
+    # Les bornes de la fenêtre peuvent porter l'extremum
+    # (astre en montée ou en descente au début ou à la fin).
+    bounds = ts.tt_jd(np.array([t.tt, t_end.tt]))
+    alt_bounds = altitude(bounds)
+
+    jd_max = np.concatenate([t_max.tt, bounds.tt])
+    jd_min = np.concatenate([t_min.tt, bounds.tt])
+    values_max = np.concatenate([alt_max, alt_bounds])
+    values_min = np.concatenate([alt_min, alt_bounds])
+    jd = np.array([jd_min[np.argmin(values_min)], jd_max[np.argmax(values_max)]])
+
+    extremes = ts.tt_jd(jd)
+    alt, az, _ = _altaz(observer, body, extremes, positions)
+    times = extremes.utc_datetime()
+    return ((times[0], az.degrees[0], alt.degrees[0]),
+            (times[1], az.degrees[1], alt.degrees[1]))
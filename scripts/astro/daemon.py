@@ -0,0 +1,204 @@
+"""
+Resident astronomy service.
+
+The ephemerides and kernels are loaded once by the process that imports the
+payload functions; the service then answers requests on a local TCP socket
+and, optionally, publishes the same payloads on MQTT topics.
+
+Protocol: the client sends one line holding the payload name (``planets``,
+``sun``, ``moon``, ...) and receives one line of JSON. With Node-RED, a
+``tcp request`` node connected to 127.0.0.1:8765, sending ``planets\\n`` and
+splitting the answer on ``\\n``, replaces the ``pythonshell in`` node.
+
+With MQTT, the ON/OFF state of each planet is also published on
+``<prefix>/planets/<name>/state`` at the instant it rises or sets (see
+``publish_horizon_states``), together with the Home Assistant discovery
+configuration of the matching binary sensors. With ``--images``, the
+dashboard images are rendered in the service and published on
+``<prefix>/images/<name>`` (see ``astro.render``).
+"""
+import argparse
+import json
+import socketserver
+import threading
+import time
+
+DEFAULT_HOST = '127.0.0.1'
+DEFAULT_PORT = 8765
+
+
+class _RequestHandler(socketserver.StreamRequestHandler):
+
+    def handle(self):
+        for line in self.rfile:
+            name = line.decode('utf-8').strip()
+            if not name:
+                continue
+            payload = self.server.answer(name)
+            self.wfile.write((json.dumps(payload) + '\n').encode('utf-8'))
+
+
+class AstronomyServer(socketserver.ThreadingTCPServer):
+    """
+    Parameters
+    ----------
+    address : (host, port)
+    handlers : dict mapping a payload name to a function without argument
+               returning a JSON-serializable object
+    """
+    allow_reuse_address = True
+    daemon_threads = True
+
+    def __init__(self, address, handlers):
+        super().__init__(address, _RequestHandler)
+        self.handlers = handlers
+        self.lock = threading.Lock()  # Skyfield n'est pas prévu pour plusieurs threads
+
+    def answer(self, name):
+        """Returns the payload for name, or an error dict."""
+        handler = self.handlers.get(name)
+        if handler is None:
+            return {"error": f"unknown payload '{name}'", "payloads": sorted(self.handlers)}
+        with self.lock:
+            try:
+                return handler()
+            except Exception as e:
+                return {"error": f"{type(e).__name__}: {e}"}
+
+
+def mqtt_client(host, port=1883):
+    """Returns a connected paho-mqtt client running its network loop in a thread."""
+    import paho.mqtt.client as mqtt  # dépendance optionnelle
+
+    if hasattr(mqtt, 'CallbackAPIVersion'):  # paho-mqtt >= 2.0
+        client = mqtt.Client(mqtt.CallbackAPIVersion.VERSION2)
+    else:
+        client = mqtt.Client()
+    client.connect(host, port)
+    client.loop_start()
+    return client
+
+
+def publish_mqtt(server, host, port=1883, topic_prefix='astronomy', interval=60):
+    """Publishes every payload of the server on <topic_prefix>/<name> every interval seconds."""
+    client = mqtt_client(host, port)
+    while True:
+        for name in server.handlers:
+            payload = server.answer(name)
+            client.publish(f'{topic_prefix}/{name}', json.dumps(payload), retain=True)
+        time.sleep(interval)
+
+
+def publish_horizon_states(host, port=1883, topic_prefix='astronomy', discovery_prefix='homeassistant',
+                           max_sleep=3600):
+    """
+    Publishes the ON/OFF state of each planet when it crosses the horizon.
+
+    The next crossing of every planet is searched once; the thread then sleeps
+    until the earliest one and publishes only the states that changed. The
+    states are also republished every max_sleep seconds, in case the broker
+    lost its retained messages.
+    """
+    import astronomy
+    from astro import resources
+    from astro.earth_orientation import configure_astronomy_engine
+    from astro.planets import planets
+    from astro.scheduler import EventScheduler
+
+    # Même observateur et même Delta T que l'état ON/OFF du payload des planètes
+    observer = resources.astronomy_observer()
+    configure_astronomy_engine(resources.timescale())
+    client = mqtt_client(host, port)
+    scheduler = EventScheduler()
+    for planet in planets:
+        name = planet.name.lower()
+        if discovery_prefix:
+            config = {
+                "name": f"Planet {planet.name}",
+                "unique_id": f"{topic_prefix}_planet_{name}",
+                "state_topic": f'{topic_prefix}/planets/{name}/state',
+            }
+            client.publish(f'{discovery_prefix}/binary_sensor/{topic_prefix}_planet_{name}/config',
+                           json.dumps(config), retain=True)
+
+    states = {}
+    refreshed = 0.0
+    while True:
+        now = astronomy.Time.Now()
+        wake = now.AddDays(max_sleep / 86400)
+        refresh = time.monotonic() - refreshed >= max_sleep
+        if refresh:
+            refreshed = time.monotonic()
+        for planet in planets:
+            state = scheduler.is_up(planet, observer, now)
+            if refresh or states.get(planet) != state:
+                client.publish(f'{topic_prefix}/planets/{planet.name.lower()}/state', state, retain=True)
+                states[planet] = state
+            event, _ = scheduler.horizon_crossing(planet, observer, now)
+            if event is not None and event.ut < wake.ut:
+                wake = event
+        # Petite marge pour se réveiller juste après l'instant du passage
+        time.sleep(max(0.0, (wake.ut - astronomy.Time.Now().ut) * 86400) + 0.5)
+
+
+def publish_images(server, host, port=1883, topic_prefix='astronomy', interval=60):
+    """Renders the dashboard images every interval seconds and publishes those that changed."""
+    from astro.render import MqttSink, render_all
+
+    sink = MqttSink(mqtt_client(host, port), topic_prefix)
+    force = True  # tout republier au démarrage, le broker a pu perdre ses messages
+    while True:
+        with server.lock:
+            try:
+                render_all(sinks=[sink], force=force)
+                force = False
+            except Exception as e:
+                print(f"Error rendering images: {type(e).__name__}: {e}")
+        time.sleep(interval)
+
+
+def serve(handlers, host=DEFAULT_HOST, port=DEFAULT_PORT, mqtt_host=None, mqtt_port=1883,
+          topic_prefix='astronomy', interval=60, images=False):
+    """
+    Answers requests until interrupted, publishing on MQTT as well if mqtt_host
+    is given, including the dashboard images if images is true.
+    """
+    with AstronomyServer((host, port), handlers) as server:
+        if mqtt_host:
+            threading.Thread(target=publish_mqtt, daemon=True,
+                             args=(server, mqtt_host, mqtt_port, topic_prefix, interval)).start()
+            threading.Thread(target=publish_horizon_states, daemon=True,
+                             args=(mqtt_host, mqtt_port, topic_prefix)).start()
+            if images:
+                threading.Thread(target=publish_images, daemon=True,
+                                 args=(server, mqtt_host, mqtt_port, topic_prefix, interval)).start()
+        server.serve_forever()
+
+
+def get_handlers():
+    """Payloads served by default: the planets of the flow, the Sun and the Moon."""
+    from astro import moon, resources, sun
+    from astro.planets import get_planet_data
+
+    ts = resources.timescale()
+    return {
+        'planets': get_planet_data,
+        'sun': lambda: sun.get_sun_report(ts.now()),
+        'moon': lambda: moon.get_moon_report(ts.now()),
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog='python -m astro daemon',
+                                     description='Service astronomique résident.')
+    parser.add_argument('--host', default=DEFAULT_HOST)
+    parser.add_argument('--port', type=int, default=DEFAULT_PORT)
+    parser.add_argument('--mqtt', metavar='HOST', help='publie aussi les données sur ce broker MQTT')
+    parser.add_argument('--mqtt-port', type=int, default=1883)
+    parser.add_argument('--topic-prefix', default='astronomy')
+    parser.add_argument('--interval', type=int, default=60, help='période de publication MQTT (s)')
+    parser.add_argument('--images', action='store_true',
+                        help='publie aussi les images du tableau de bord (avec --mqtt)')
+    args = parser.parse_args(argv)
+    serve(get_handlers(), args.host, args.port, args.mqtt, args.mqtt_port,
+          args.topic_prefix, args.interval, args.images)
@@ -0,0 +1,130 @@
+"""
+Earth orientation (UT1 - UTC, polar motion) and Delta T, without network.
+
+All the libraries read the same IERS file, ``finals2000A.all``, kept in the
+working folder next to the ephemeris files (EARTH_ORIENTATION of the
+settings). It is only downloaded, replaced atomically, by an explicit::
+
+    python -m astro iers
+
+and never during a computation:
+
+- Skyfield: ``timescale()`` builds the timescale (Delta T, leap seconds,
+  polar motion) from the file, parsed once into ``cache/earth_orientation.npz``
+  until the file changes; without the file, the tables bundled with
+  Skyfield are used, as ``load.timescale()`` does;
+- astropy: ``configure_astropy()`` turns off its automatic downloads and
+  installs the same file as its IERS-A table; without the file, astropy
+  keeps its bundled IERS-B table and only warns for later dates;
+- astronomy-engine: ``configure_astronomy_engine(ts)`` makes it take Delta T
+  from the Skyfield timescale instead of its long-term formula.
+
+``identity()`` names the tables in use, for the caches whose content
+depends on the Earth's rotation.
+"""
+import argparse
+import os
+import urllib.request
+
+import numpy as np
+from skyfield.api import load
+from skyfield.data import iers
+from skyfield.timelib import Timescale
+
+from astro import settings
+from astro.settings import cache_path
+
+FINALS_URL = 'https://datacenter.iers.org/data/9/finals2000A.all'
+VERSION = 1
+
+
+def identity(path=None):
+    """Identity of the Earth orientation tables: size and date of the file, or 'builtin'."""
+    path = path or settings.EARTH_ORIENTATION
+    try:
+        stat = os.stat(path)
+    except OSError:
+        return 'builtin'
+    return f'{VERSION}:{stat.st_size}:{stat.st_mtime_ns}'
+
+
+def _tables(path):
+    """Columns utc_mjd, x_arcseconds, y_arcseconds, dut1 of the file, parsed once per version of the file."""
+    key = identity(path)
+    stored = cache_path('earth_orientation.npz')
+    try:
+        with np.load(stored) as f:
+            if str(f['key']) == key:
+                return {name: f[name] for name in f.files if name != 'key'}
+    except (OSError, KeyError, ValueError):
+        pass
+    with open(path, 'rb') as f:
+        data = iers.parse_x_y_dut1_from_finals_all(f)
+    tables = {name: np.array(data[name]) for name in data.dtype.names}
+    tmp = f'{stored}.{os.getpid()}.tmp'
+    with open(tmp, 'wb') as f:
+        np.savez_compressed(f, key=np.array(key), **tables)
+    os.replace(tmp, stored)
+    return tables
+
+
+def timescale(path=None):
+    """Skyfield timescale from the IERS file, or from the tables bundled with Skyfield if it is missing."""
+    path = path or settings.EARTH_ORIENTATION
+    if not os.path.exists(path):
+        return load.timescale()
+    tables = _tables(path)
+    daily_tt, daily_delta_t, leap_dates, leap_offsets = iers.build_timescale_arrays(tables['utc_mjd'],
+                                                                                   tables['dut1'])
+    ts = Timescale((daily_tt, daily_delta_t), leap_dates, leap_offsets)
+    iers.install_polar_motion_table(ts, tables)
+    return ts
+
+
+def configure_astropy(path=None):
+    """Makes astropy use the IERS file and never download anything."""
+    from astropy.utils import iers as astropy_iers
+
+    path = path or settings.EARTH_ORIENTATION
+    astropy_iers.conf.auto_download = False
+    astropy_iers.conf.auto_max_age = None
+    if os.path.exists(path):
+        astropy_iers.earth_orientation_table.set(astropy_iers.IERS_A.open(os.path.abspath(path)))
+    else:
+        # Table IERS-B fournie avec astropy : avertissement au-delà de sa fin
+        astropy_iers.conf.iers_degraded_accuracy = 'warn'
+
+
+def configure_astronomy_engine(ts):
+    """Makes astronomy-engine take Delta T from the Skyfield timescale ts."""
+    from astronomy import astronomy
+
+    # astronomy-engine passe UT (jours depuis J2000) ; Delta T varie de
+    # quelques millisecondes par jour, l'écart UT/TT est donc sans effet
+    astronomy._DeltaT = lambda ut: float(ts.delta_t_function(ut + 2451545.0))
+
+
+def refresh(url=FINALS_URL, path=None):
+    """Downloads the IERS file to path, replacing the previous one only once complete."""
+    path = path or settings.EARTH_ORIENTATION
+    tmp = f'{path}.{os.getpid()}.tmp'
+    with urllib.request.urlopen(url, timeout=60) as response, open(tmp, 'wb') as f:
+        f.write(response.read())
+    with open(tmp, 'rb') as f:
+        if not len(iers.parse_x_y_dut1_from_finals_all(f)):
+            os.remove(tmp)
+            raise ValueError(f'{url} is not a finals2000A.all file')
+    os.replace(tmp, path)
+    return path
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog='python -m astro iers',
+                                     description="Télécharge les paramètres d'orientation de la Terre (IERS).")
+    parser.add_argument('--url', default=FINALS_URL, help='adresse du fichier finals2000A.all')
+    args = parser.parse_args(argv)
+    path = refresh(args.url)
+    tables = _tables(path)
+    ts = timescale(path)
+    first, last = ts.utc(1858, 11, 17.0 + tables['utc_mjd'][[0, -1]]).utc_strftime('%Y-%m-%d')
+    print(f"{path} : du {first} au {last}")
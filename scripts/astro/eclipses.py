@@ -0,0 +1,165 @@
+"""
+Lunar eclipse catalog.
+
+The eclipses found by ``eclipselib.lunar_eclipses`` are stored, with all
+their ``details`` fields, in a compressed ``.npz`` file of the cache folder,
+sorted by time. Queries are answered by binary search on that array; when a
+query falls outside the span already covered, only the missing part is
+searched, a year at least, and the file is extended when new eclipses are
+found. The whole span of the bundled lunar kernel (1900-2050) can be built
+once with ``build()``::
+
+    python -m astro eclipses
+"""
+import os
+
+import numpy as np
+from skyfield import eclipselib
+
+from astro.event_cache import EventCache
+from astro.settings import cache_path
+
+START = (1900, 1, 1)  # étendue de moon_pa_de421_1900-2050.bpc
+END = (2050, 1, 1)
+YEAR = 365.25
+EDGE_DAYS = 7  # lunar_eclipses échantillonne quelques jours avant le début
+
+
+class EclipseCatalog:
+    """
+    Parameters
+    ----------
+    eph : Skyfield ephemeris, e.g. load('de421.bsp')
+    path : .npz file, by default lunar_eclipses_<ephemeris>.npz in the cache folder
+    """
+
+    def __init__(self, eph, path=None, event_cache=None):
+        self.eph = eph
+        name = os.path.splitext(os.path.basename(eph.path))[0]
+        self.path = path or cache_path(f'lunar_eclipses_{name}.npz')
+        self.event_cache = event_cache or EventCache()
+        self._data = None
+
+    def _load(self):
+        if self._data is None:
+            ephemeris = self.event_cache.file_hash(self.eph.path)
+            data = None
+            if os.path.exists(self.path):
+                with np.load(self.path) as f:
+                    if str(f['ephemeris']) == ephemeris:
+                        data = {name: f[name] for name in f.files}
+            if data is None:
+                data = {'ephemeris': np.array(ephemeris),
+                        'coverage': np.array([np.nan, np.nan]),
+                        'tt': np.empty(0), 'types': np.empty(0, dtype=int)}
+            self._data = data
+        return self._data
+
+    def _save(self):
+        tmp = f'{self.path}.{os.getpid()}.tmp'
+        with open(tmp, 'wb') as f:
+            np.savez_compressed(f, **self._data)
+        os.replace(tmp, self.path)
+
+    def _search(self, ts, jd0, jd1):
+        t, y, details = eclipselib.lunar_eclipses(ts.tt_jd(jd0), ts.tt_jd(jd1), self.eph)
+        found = {'tt': t.tt, 'types': np.asarray(y, dtype=int)}
+        for name, values in details.items():
+            found['detail_' + name] = np.asarray(values)
+        return found
+
+    def _span(self):
+        """TDB Julian dates covered by all the segments of the ephemeris."""
+        segments = [s.spk_segment for s in self.eph.segments]
+        return max(s.start_jd for s in segments), min(s.end_jd for s in segments)
+
+    def ensure(self, t0, t1):
+        """Extends the catalog so that it covers [t0, t1]."""
+        data = self._load()
+        lo, hi = data['coverage']
+        jd0, jd1 = float(t0.tt), float(t1.tt)
+        # Étendue agrandie d'au moins un an, pour ne pas chercher à nouveau
+        # à chaque appel quand la date avance, sans sortir de l'éphéméride
+        first, last = self._span()
+        if np.isnan(lo):
+            after = max(jd1, min(jd0 + YEAR, last - EDGE_DAYS))
+            pieces = [(jd0, after)]
+            lo, hi = jd0, after
+        else:
+            pieces = []
+            if jd0 < lo:
+                before = min(jd0, max(lo - YEAR, first + EDGE_DAYS))
+                pieces.append((before, lo))
+                lo = before
+            if jd1 > hi:
+                after = max(jd1, min(hi + YEAR, last - EDGE_DAYS))
+                pieces.append((hi, after))
+                hi = after
+        if not pieces:
+            return
+
+        found = [self._search(t0.ts, a, b) for a, b in pieces]
+        data['coverage'] = np.array([lo, hi])
+        count = len(data['tt'])
+        for name in found[0]:
+            old = data.get(name, np.empty(0))
+            data[name] = np.concatenate([old] + [f[name] for f in found])
+        order = np.argsort(data['tt'], kind='stable')
+        tt = data['tt'][order]
+        # Une éclipse à la jonction de deux recherches est trouvée deux fois
+        keep = np.diff(tt, prepend=-np.inf) > 0.5
+        for name in found[0]:
+            data[name] = data[name][order][keep]
+        # Sans nouvelle éclipse, l'étendue n'est retenue qu'en mémoire
+        if len(data['tt']) > count:
+            self._save()
+
+    def build(self, ts):
+        """Computes the catalog over the whole span of the lunar kernel (1900-2050)."""
+        self.ensure(ts.utc(*START), ts.utc(*END))
+
+    def _select(self, ts, index):
+        data = self._data
+        details = {name[len('detail_'):]: data[name][index]
+                   for name in data if name.startswith('detail_')}
+        return ts.tt_jd(data['tt'][index]), data['types'][index], details
+
+    def between(self, t0, t1):
+        """Returns times, types, details of the eclipses in [t0, t1], like eclipselib.lunar_eclipses."""
+        self.ensure(t0, t1)
+        tt = self._data['tt']
+        i = np.searchsorted(tt, t0.tt, side='left')
+        j = np.searchsorted(tt, t1.tt, side='right')
+        return self._select(t0.ts, slice(i, j))
+
+    def next_after(self, t):
+        """
+        Returns time, type, details of the first eclipse after t, or None if
+        there is none within five years and before the end of the ephemeris.
+        """
+        ts = t.ts
+        end = self._span()[1] - EDGE_DAYS
+        for years in (1, 2, 5):
+            jd1 = min(t.tt + years * YEAR, end)
+            if jd1 <= t.tt:
+                break
+            self.ensure(t, ts.tt_jd(jd1))
+            tt = self._data['tt']
+            i = np.searchsorted(tt, t.tt, side='right')
+            if i < len(tt):
+                return self._select(ts, i)
+        return None
+
+
+def main(argv=None):
+    from astro import resources
+
+    ts = resources.timescale()
+    catalog = resources.eclipse_catalog()
+    catalog.build(ts)
+    times, types, details = catalog.between(ts.utc(*START), ts.utc(*END))
+    print(f"{len(times)} éclipses de Lune enregistrées dans {catalog.path}")
+
+
+if __name__ == '__main__':
+    main()
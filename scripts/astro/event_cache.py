@@ -0,0 +1,121 @@
+"""
+Persistent cache of almanac searches.
+
+Rise/set times and twilights found for a given window and observer never
+change, so their results are stored in a SQLite file shared by every
+process (the lunar eclipses have their own catalog, ``astro.eclipses``). An entry is keyed by the search function, the body, the
+observer, a hash of the ephemeris file and the time window; a repeated
+query is a single primary-key lookup instead of a root search.
+"""
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+
+import numpy as np
+from skyfield import almanac
+
+from astro.settings import cache_path
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS events (
+    function TEXT NOT NULL,
+    body TEXT NOT NULL,
+    observer TEXT NOT NULL,
+    ephemeris TEXT NOT NULL,
+    start_tt REAL NOT NULL,
+    end_tt REAL NOT NULL,
+    value TEXT NOT NULL,
+    PRIMARY KEY (function, body, observer, ephemeris, start_tt, end_tt)
+);
+CREATE TABLE IF NOT EXISTS file_hashes (
+    path TEXT PRIMARY KEY,
+    size INTEGER NOT NULL,
+    mtime REAL NOT NULL,
+    sha1 TEXT NOT NULL
+);
+"""
+
+
+def observer_key(topos):
+    """Returns the text key of a wgs84 position, or '' for a geocentric search."""
+    if topos is None:
+        return ''
+    return (f'{topos.latitude.degrees:.6f},{topos.longitude.degrees:.6f},'
+            f'{topos.elevation.m:.1f}')
+
+
+class EventCache:
+    """
+    Parameters
+    ----------
+    path : SQLite file, by default events.sqlite in the cache folder
+
+    A connection is opened per thread: the resident service answers each
+    client, and publishes to MQTT, from threads of its own.
+    """
+
+    def __init__(self, path=None):
+        self.path = path
+        self._local = threading.local()
+
+    @property
+    def connection(self):
+        connection = getattr(self._local, 'connection', None)
+        if connection is None:
+            path = self.path or cache_path('events.sqlite')
+            connection = sqlite3.connect(path, timeout=30)
+            connection.executescript(_SCHEMA)
+            self._local.connection = connection
+        return connection
+
+    def file_hash(self, path):
+        """SHA-1 of a file, recomputed only when its size or mtime changes."""
+        stat = os.stat(path)
+        path = os.path.abspath(path)
+        row = self.connection.execute(
+            'SELECT sha1 FROM file_hashes WHERE path = ? AND size = ? AND mtime = ?',
+            (path, stat.st_size, stat.st_mtime)).fetchone()
+        if row:
+            return row[0]
+        sha1 = hashlib.sha1()
+        with open(path, 'rb') as f:
+            for chunk in iter(lambda: f.read(1 << 20), b''):
+                sha1.update(chunk)
+        with self.connection:
+            self.connection.execute('INSERT OR REPLACE INTO file_hashes VALUES (?, ?, ?, ?)',
+                                    (path, stat.st_size, stat.st_mtime, sha1.hexdigest()))
+        return sha1.hexdigest()
+
+    def get(self, key):
+        """Returns the stored value for key, or None."""
+        row = self.connection.execute(
+            'SELECT value FROM events WHERE function = ? AND body = ? AND observer = ?'
+            ' AND ephemeris = ? AND start_tt = ? AND end_tt = ?', key).fetchone()
+        return json.loads(row[0]) if row else None
+
+    def put(self, key, value):
+        """Stores a JSON-serializable value for key."""
+        with self.connection:
+            self.connection.execute('INSERT OR REPLACE INTO events VALUES (?, ?, ?, ?, ?, ?, ?)',
+                                    key + (json.dumps(value),))
+
+    def _key(self, function, body, topos, eph, t0, t1):
+        return (function, body, observer_key(topos), self.file_hash(eph.path),
+                float(t0.tt), float(t1.tt))
+
+    def find_discrete(self, function, body, topos, eph, t0, t1, make_function):
+        """
+        Cached almanac.find_discrete(t0, t1, make_function()).
+        function : name of the almanac function, part of the key
+        body : name of the body, part of the key
+        topos : wgs84 position of the observer (None if geocentric)
+        """
+        key = self._key(function, body, topos, eph, t0, t1)
+        value = self.get(key)
+        if value is None:
+            times, events = almanac.find_discrete(t0, t1, make_function())
+            value = {'tt': times.tt.tolist(), 'events': events.tolist()}
+            self.put(key, value)
+        return t0.ts.tt_jd(np.array(value['tt'])), np.array(value['events'], dtype=int)
@@ -0,0 +1,96 @@
+"""
+Excerpts of the ephemeris and of the lunar kernel around the current year.
+
+The dashboard only needs the positions of a few bodies for the years around
+now, while ``de421.bsp`` covers 1900-2050. ``current_excerpt()`` returns a
+copy of the ephemeris restricted to the segments of EXCERPT_TARGETS and to
+the calendar years from YEARS_BEFORE before the current year to YEARS_AFTER
+after it, written in the cache folder with jplephem's excerpt function. The
+file is named after its years, so that it is written again, and the previous
+one removed, when the current year leaves the window. Its Chebyshev
+coefficients are the ones of the full file. The binary lunar kernel
+(``moon_pa_de421_1900-2050.bpc``) gets the same treatment, with all its
+segments.
+
+jplephem reads the coefficients of both files through read-only memory maps
+of the files themselves, never copied: processes started together by
+Node-RED share the pages of the same excerpts in the page cache instead of
+holding one copy each. The excerpts are written under a name of their own
+per process and renamed, so that concurrent runs never see a partial file.
+
+The lunar eclipse catalog, which spans 1900-2050, keeps the full ephemeris.
+The excerpts can be written in advance with::
+
+    python -m astro excerpt
+"""
+import argparse
+import contextlib
+import datetime as dt
+import glob
+import os
+
+from jplephem.calendar import compute_julian_date
+from jplephem.excerpter import write_excerpt
+from jplephem.pck import PCK
+from jplephem.spk import SPK
+
+from astro import settings
+from astro.settings import cache_path
+
+YEARS_BEFORE = 1
+YEARS_AFTER = 3
+# Soleil, barycentres des planètes, Terre, Lune, Mercure, Vénus et Mars
+EXCERPT_TARGETS = (1, 2, 3, 4, 5, 6, 7, 8, 9, 10, 199, 299, 301, 399, 499)
+
+
+def excerpt_path(source, first_year, last_year):
+    """File of the excerpt of source from January 1st of first_year to January 1st of last_year + 1."""
+    name, extension = os.path.splitext(os.path.basename(source))
+    return cache_path(f'{name}_{first_year}-{last_year}{extension}')
+
+
+def write(source, path, first_year, last_year, targets=EXCERPT_TARGETS):
+    """
+    Writes the excerpt of the SPK (.bsp) or binary PCK (.bpc) file source to
+    path, with the segments of the targets only (all of them if None).
+    """
+    start_jd = compute_julian_date(first_year, 1, 1)
+    end_jd = compute_julian_date(last_year + 1, 1, 1)
+    kernel_class = PCK if source.endswith('.bpc') else SPK
+    tmp = f'{path}.{os.getpid()}.tmp'
+    kernel = kernel_class.open(source)
+    try:
+        # Le corps (cible) est le troisième élément du résumé d'un segment
+        summaries = [(name, values) for name, values in kernel.daf.summaries()
+                     if targets is None or values[2] in targets]
+        with open(tmp, 'w+b') as f:
+            write_excerpt(kernel, f, start_jd, end_jd, summaries)
+    finally:
+        kernel.close()
+    os.replace(tmp, path)
+
+
+def current_excerpt(source=None, year=None, targets=EXCERPT_TARGETS):
+    """Path of the excerpt of source (by default the ephemeris of the settings) around year, written if needed."""
+    source = source or settings.EPHEMERIS
+    year = year or dt.date.today().year
+    path = excerpt_path(source, year - YEARS_BEFORE, year + YEARS_AFTER)
+    if not os.path.exists(path):
+        write(source, path, year - YEARS_BEFORE, year + YEARS_AFTER, targets)
+        # Les extraits des fenêtres précédentes ne servent plus ; un autre
+        # processus peut les avoir déjà supprimés
+        for old in glob.glob(excerpt_path(source, '*', '*')):
+            if old != path:
+                with contextlib.suppress(FileNotFoundError):
+                    os.remove(old)
+    return path
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog='python -m astro excerpt',
+                                     description="Extrait des éphémérides autour de l'année en cours.")
+    parser.add_argument('--year', type=int, help='année centrale (défaut : année en cours)')
+    args = parser.parse_args(argv)
+    for path in (current_excerpt(year=args.year),
+                 current_excerpt(settings.MOON_BINARY_KERNEL, args.year, targets=None)):
+        print(f"{path} : {os.path.getsize(path) / 1e6:.1f} Mo")
@@ -0,0 +1,92 @@
+"""
+Fonts of the dashboard images, resolved once and kept in the cache folder.
+
+Finding the fonts means importing matplotlib's font manager and scanning
+the system font folders (``findSystemFonts``), which is one of the slowest
+parts of a run although the answer only changes when fonts are installed or
+removed. The resolved families and files are stored in fonts.json of the
+cache folder, with the families asked for and the modification times of the
+font folders and of their subfolders; as long as these are unchanged and
+the files still exist, the fonts are read back without importing matplotlib.
+"""
+import json
+import os
+import sys
+
+from astro.settings import cache_path
+
+PLANET_FAMILY = "Arial"
+DEFAULT_FAMILY = "DejaVu Sans"
+
+# Dossiers parcourus par matplotlib.font_manager.findSystemFonts
+FONT_DIRECTORIES = [
+    # Linux et Unix
+    '/usr/X11R6/lib/X11/fonts/TTF/',
+    '/usr/X11/lib/X11/fonts',
+    '/usr/share/fonts/',
+    '/usr/local/share/fonts/',
+    '/usr/lib/openoffice/share/fonts/truetype/',
+    os.path.join(os.environ.get('XDG_DATA_HOME') or os.path.expanduser('~/.local/share'), 'fonts'),
+    os.path.expanduser('~/.fonts'),
+    # macOS
+    '/Library/Fonts/',
+    '/Network/Library/Fonts/',
+    '/System/Library/Fonts/',
+    '/opt/local/share/fonts',
+    os.path.expanduser('~/Library/Fonts'),
+    # Windows
+    os.path.join(os.environ.get('WINDIR', 'C:\\WINDOWS'), 'Fonts'),
+]
+
+
+def directory_mtimes(directories=FONT_DIRECTORIES):
+    """Modification time of each existing font folder and subfolder, by path."""
+    mtimes = {}
+    for directory in directories:
+        for root, _, _ in os.walk(directory):
+            try:
+                mtimes[root] = os.stat(root).st_mtime
+            except OSError:
+                pass
+    return mtimes
+
+
+def _find_fonts():
+    """Fonts of the planet and Moon images, found with matplotlib's font manager."""
+    import matplotlib.font_manager as fm
+
+    planet_family = PLANET_FAMILY if any(font.name == PLANET_FAMILY for font in fm.fontManager.ttflist) \
+        else DEFAULT_FAMILY
+    font_paths = fm.findSystemFonts(fontpaths=None, fontext='ttf')
+    moon_family = fm.FontProperties(fname=font_paths[0]).get_name() if font_paths else DEFAULT_FAMILY
+    # Fichiers que matplotlib choisit pour ces familles, pour le dessin sans matplotlib
+    return (planet_family, str(fm.findfont(planet_family))), (moon_family, str(fm.findfont(moon_family)))
+
+
+def resolve_fonts(path=None):
+    """
+    Returns the fonts of the planet images (Arial if installed) and of the
+    Moon image (the first font found on the system), as (family, path)
+    pairs, from the cache when the font folders have not changed. The paths
+    are None without matplotlib.
+    """
+    path = path or cache_path('fonts.json')
+    key = {'families': [PLANET_FAMILY, DEFAULT_FAMILY], 'platform': sys.platform,
+           'directories': directory_mtimes()}
+    try:
+        with open(path) as f:
+            cached = json.load(f)
+        if cached['key'] == key and all(os.path.exists(font) for _, font in cached['fonts']):
+            return tuple(tuple(font) for font in cached['fonts'])
+    except (OSError, ValueError, KeyError, TypeError):
+        pass
+
+    try:
+        fonts = _find_fonts()
+    except ImportError:
+        return (DEFAULT_FAMILY, None), (DEFAULT_FAMILY, None)
+    tmp = f'{path}.{os.getpid()}.tmp'
+    with open(tmp, 'w') as f:
+        json.dump({'key': key, 'fonts': fonts}, f, indent=1)
+    os.replace(tmp, path)
+    return fonts
@@ -0,0 +1,172 @@
+"""
+Apparent magnitude, angular diameter and surface brightness of the planets.
+
+The magnitudes follow Mallama and Hilton, "Computing apparent planetary
+magnitudes for The Astronomical Almanac" (2018), the models used by JPL
+Horizons for its ``V`` field: a phase curve per planet, with Saturn's
+rings through the saturnicentric latitudes of the Sun and of the observer
+(the ring tilt), Uranus' polar brightening and Neptune's secular change.
+Mars is without its rotational and orbital corrections (±0.06 mag). Pluto
+follows The Astronomical Almanac (V(1,0) = -1.0, 0.04 mag per degree).
+Two curves are only defined over the phase angles seen from the Earth:
+Saturn beyond 6.5° and Neptune beyond 1.9° before 2000 give NaN.
+
+Everything works on arrays: ``magnitudes`` takes the Sun-planet and
+observer-planet vectors of any number of planets and dates, and
+``photometry`` computes them from the ephemeris for a Skyfield time array,
+so that a year of magnitude curves for all the planets is one call::
+
+    t = ts.utc(2026, 1, range(1, 366))
+    photometry(['venus', 'mars', 'saturn'], t)['magnitude']  # (3, 365)
+"""
+import numpy as np
+
+from astro import resources
+
+KM_PER_AU = 149597870.7
+RADIAN_ARCSEC = 180 / np.pi * 3600
+
+# Rayons équatorial et polaire (km) et pôle nord (ascension droite et
+# déclinaison J2000, degrés), IAU 2015
+EQUATORIAL_RADIUS_KM = {'mercury': 2440.53, 'venus': 6051.8, 'mars': 3396.19, 'jupiter': 71492.0,
+                        'saturn': 60268.0, 'uranus': 25559.0, 'neptune': 24764.0, 'pluto': 1188.3}
+POLAR_RADIUS_KM = {'mercury': 2438.26, 'venus': 6051.8, 'mars': 3376.20, 'jupiter': 66854.0,
+                   'saturn': 54364.0, 'uranus': 24973.0, 'neptune': 24341.0, 'pluto': 1188.3}
+POLE_RA_DEC = {'mercury': (281.01, 61.42), 'venus': (272.76, 67.16), 'mars': (317.681, 52.887),
+               'jupiter': (268.057, 64.495), 'saturn': (40.589, 83.537), 'uranus': (257.311, -15.175),
+               'neptune': (299.36, 43.46), 'pluto': (132.993, -6.163)}
+
+
+def _pole(name):
+    ra, dec = np.radians(POLE_RA_DEC[name])
+    return np.array([np.cos(dec) * np.cos(ra), np.cos(dec) * np.sin(ra), np.sin(dec)])
+
+
+def _sub_latitude(pole, direction):
+    """Planetocentric latitude (degrees) of the point of the planet facing direction, arrays (3, ...)."""
+    direction = direction / np.linalg.norm(direction, axis=0)
+    return np.degrees(np.arcsin(np.clip(np.tensordot(pole, direction, axes=1), -1.0, 1.0)))
+
+
+def _mercury(r, delta, alpha, **_):
+    phase = alpha * (6.3280e-02 + alpha * (-1.6336e-03 + alpha * (3.3644e-05 + alpha * (
+        -3.4265e-07 + alpha * (1.6893e-09 - 3.0334e-12 * alpha)))))
+    return -0.613 + 5 * np.log10(r * delta) + phase
+
+
+def _venus(r, delta, alpha, **_):
+    # Deux courbes, de part et d'autre de 163,7°
+    near = alpha * (-1.044e-03 + alpha * (3.687e-04 + alpha * (-2.814e-06 + 8.938e-09 * alpha)))
+    far = 240.44228 + alpha * (-2.81914 + 8.39034e-03 * alpha)
+    return -4.384 + 5 * np.log10(r * delta) + np.where(alpha < 163.7, near, far)
+
+
+def _mars(r, delta, alpha, **_):
+    near = -1.601 + alpha * (2.267e-02 - 1.302e-04 * alpha)
+    far = -0.367 + alpha * (-0.02573 + 3.445e-04 * alpha)
+    return 5 * np.log10(r * delta) + np.where(alpha <= 50.0, near, far)
+
+
+def _jupiter(r, delta, alpha, **_):
+    x = alpha / 180.0
+    near = -9.395 + alpha * (-3.7e-04 + 6.16e-04 * alpha)
+    far = -9.428 - 2.5 * np.log10(1.0 + x * (-1.507 + x * (-0.363 + x * (-0.062 + x * (2.809 - 1.876 * x)))))
+    return 5 * np.log10(r * delta) + np.where(alpha <= 12.0, near, far)
+
+
+def _saturn(r, delta, alpha, sun_latitude, observer_latitude, **_):
+    # Anneaux : moyenne géométrique des latitudes du Soleil et de
+    # l'observateur, nulle si les anneaux sont éclairés par l'autre face
+    product = sun_latitude * observer_latitude
+    tilt = np.radians(np.sqrt(np.where(product > 0, product, 0.0)))
+    mag = -8.914 - 1.825 * np.sin(tilt) + 0.026 * alpha - 0.378 * np.sin(tilt) * np.exp(-2.25 * alpha)
+    return np.where((alpha <= 6.5) & (tilt <= np.radians(27.0)), mag + 5 * np.log10(r * delta), np.nan)
+
+
+def _uranus(r, delta, alpha, sun_latitude, observer_latitude, **_):
+    latitude = (np.abs(sun_latitude) + np.abs(observer_latitude)) / 2
+    phase = np.where(alpha > 3.1, alpha * (6.587e-3 + 1.045e-4 * alpha), 0.0)
+    return -7.110 + 5 * np.log10(r * delta) - 8.4e-04 * latitude + phase
+
+
+def _neptune(r, delta, alpha, year, **_):
+    mag = np.clip(-6.89 - 0.0054 * (year - 1980.0), -7.00, -6.89) + 5 * np.log10(r * delta)
+    phase = np.where(year >= 2000.0, alpha * (7.944e-3 + 9.617e-5 * alpha), np.nan)
+    return np.where(alpha > 1.9, mag + phase, mag)
+
+
+def _pluto(r, delta, alpha, **_):
+    return -1.00 + 0.04 * alpha + 5 * np.log10(r * delta)
+
+
+MAGNITUDE_MODELS = {'mercury': _mercury, 'venus': _venus, 'mars': _mars, 'jupiter': _jupiter,
+                    'saturn': _saturn, 'uranus': _uranus, 'neptune': _neptune, 'pluto': _pluto}
+
+
+def magnitudes(names, sun_to_planet, observer_to_planet, year):
+    """
+    Photometry of the planets from their geometry.
+
+    Parameters
+    ----------
+    names : planet names, keys of MAGNITUDE_MODELS
+    sun_to_planet, observer_to_planet : arrays (len(names), 3, ...) of
+        vectors in au on the ICRS axes
+    year : Julian year of the dates, array (...)
+
+    Returns a dict of arrays (len(names), ...): magnitude, phase_angle
+    (degrees), illumination (fraction 0-1), angular_diameter (equatorial,
+    arcseconds), surface_brightness (magnitude per square arcsecond of the
+    lit part of the disc) and ring_tilt (saturnicentric latitude of the
+    observer for Saturn, planetocentric for the others, degrees).
+    """
+    sun_to_planet = np.asarray(sun_to_planet, dtype=float)
+    observer_to_planet = np.asarray(observer_to_planet, dtype=float)
+    shape = (len(names),) + sun_to_planet.shape[2:]
+    result = {key: np.empty(shape) for key in ('magnitude', 'phase_angle', 'illumination', 'angular_diameter',
+                                               'surface_brightness', 'ring_tilt')}
+    for i, name in enumerate(names):
+        r = np.linalg.norm(sun_to_planet[i], axis=0)
+        delta = np.linalg.norm(observer_to_planet[i], axis=0)
+        cos_alpha = np.sum(sun_to_planet[i] * observer_to_planet[i], axis=0) / (r * delta)
+        alpha = np.degrees(np.arccos(np.clip(cos_alpha, -1.0, 1.0)))
+        pole = _pole(name)
+        sun_latitude = _sub_latitude(pole, -sun_to_planet[i])
+        observer_latitude = _sub_latitude(pole, -observer_to_planet[i])
+        magnitude = MAGNITUDE_MODELS[name](r, delta, alpha, sun_latitude=sun_latitude,
+                                           observer_latitude=observer_latitude, year=np.asarray(year))
+
+        # Disque vu de l'observateur : ellipse dont le petit axe dépend de
+        # l'inclinaison du pôle, éclairée sur la fraction (1 + cos alpha) / 2
+        equatorial = EQUATORIAL_RADIUS_KM[name] / KM_PER_AU
+        polar = POLAR_RADIUS_KM[name] / KM_PER_AU
+        latitude = np.radians(observer_latitude)
+        apparent_polar = np.hypot(equatorial * np.sin(latitude), polar * np.cos(latitude))
+        illumination = (1 + cos_alpha) / 2
+        area_arcsec2 = np.pi * equatorial * apparent_polar / delta ** 2 * RADIAN_ARCSEC ** 2 * illumination
+
+        result['magnitude'][i] = magnitude
+        result['phase_angle'][i] = alpha
+        result['illumination'][i] = illumination
+        result['angular_diameter'][i] = 2 * np.degrees(np.arcsin(equatorial / delta)) * 3600
+        with np.errstate(divide='ignore'):
+            result['surface_brightness'][i] = magnitude + 2.5 * np.log10(area_arcsec2)
+        result['ring_tilt'][i] = observer_latitude
+    return result
+
+
+def photometry(names, t, eph=None, observer=None):
+    """
+    Photometry of the planets at the Skyfield time t (scalar or array),
+    seen from observer (Skyfield vector, by default the center of the
+    Earth, like the Horizons fields). Returns the dict of ``magnitudes``,
+    arrays (len(names),) + t.shape.
+    """
+    from astro.planet_batch import PLANETS
+
+    eph = eph or resources.ephemeris()
+    observer_at = (observer or eph['earth']).at(t)
+    sun = eph['sun'].at(t).position.au
+    observer_to_planet = np.stack([observer_at.observe(eph[PLANETS[name]]).position.au for name in names])
+    sun_to_planet = observer_to_planet + (observer_at.position.au - sun)
+    return magnitudes(names, sun_to_planet, observer_to_planet, t.J)
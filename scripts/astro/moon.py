@@ -0,0 +1,190 @@
+"""
+Moon: rise and set, position, phase, illumination, libration and eclipses.
+
+Run ``python -m astro moon`` (or ``scripts/moon_calculations.py``) from the
+folder holding the ephemeris and lunar kernel files to print the report.
+"""
+from skyfield import almanac, eclipselib
+from datetime import timedelta
+from dateutil.relativedelta import relativedelta
+from math import cos, radians
+
+from astro import analytic, resources
+from astro.constellations import current_constellation
+from astro.culmination import altitude_extrema
+from astro.snapshot import snapshot_at
+
+def nearest_minute(dt):
+    return (dt + timedelta(seconds=30)).replace(second=0, microsecond=0)
+
+def get_day_bounds(t):
+    # Début du jour (UTC) de t, du lendemain, du surlendemain et un an plus tard
+    ts = resources.timescale()
+    dt = t.utc_datetime()
+    t0 = ts.utc(dt.year, dt.month, dt.day)
+    t1 = ts.utc((dt + timedelta(days=1)).year, (dt + timedelta(days=1)).month, (dt + timedelta(days=1)).day)
+    t2 = ts.utc((dt + timedelta(days=2)).year, (dt + timedelta(days=2)).month, (dt + timedelta(days=2)).day)
+    t365 = ts.utc((dt + relativedelta(years=1)).year, (dt + relativedelta(years=1)).month, (dt + relativedelta(years=1)).day)
+    return t0, t1, t2, t365
+
+def get_next_moonrise_moonset(observer, t0, t1, t=None):
+    # Premiers lever et coucher après t (par défaut : maintenant)
+    if t is None:
+        t = resources.timescale().now()
+    dt = t.utc_datetime()
+    eph = resources.ephemeris()
+    moon = eph['moon']
+    times_moon, events_moon = resources.event_cache().find_discrete('risings_and_settings', 'moon', observer, eph, t0, t1,
+                                                                    lambda: almanac.risings_and_settings(eph, moon, observer))
+
+    next_moonrise = None
+    next_moonset = None
+
+    for t, e in zip(times_moon, events_moon):
+        if t.utc_datetime() > dt:
+            rounded_time = nearest_minute(t.utc_datetime())
+            rounded_time_paris = rounded_time.astimezone(resources.timezone())
+            if e and next_moonrise is None:
+                next_moonrise = rounded_time_paris
+            elif not e and next_moonset is None:
+                next_moonset = rounded_time_paris
+            if next_moonrise and next_moonset:
+                break
+
+    return next_moonrise, next_moonset
+
+def get_snapshot(t):
+    # Positions de la Lune et du Soleil calculées une seule fois pour l'instant t
+    return snapshot_at(resources.ephemeris(), resources.observer(), t, resources.position_cache())
+
+def get_moon_altaz(t, backend='skyfield'):
+    # backend='analytic' : séries analytiques, rapides mais approchées (voir astro/analytic.py)
+    if backend == 'analytic':
+        return analytic.moon_altaz(t)
+    alt, az, d = get_snapshot(t).altaz('moon')
+    return alt, az, d
+
+def get_moon_ra_dec(t, backend='skyfield'):
+    if backend == 'analytic':
+        return analytic.moon_ra_dec(t)
+    ra, dec, d = get_snapshot(t).radec('moon')
+    return ra, dec, d
+
+def get_moon_phase_angle(t):
+    return get_snapshot(t).elongation('moon')
+
+def get_moon_illumination(t):
+    return (1 + cos(radians(get_moon_phase_angle(t)))) / 2
+
+def get_moon_libration(t):
+    eph = resources.ephemeris()
+    p = (eph['earth'] - eph['moon']).at(t)
+    lat, lon, distance = p.frame_latlon(resources.moon_frame())
+    lat_degrees = lat.degrees
+    lon_degrees = (lon.degrees + 180.0) % 360.0 - 180.0
+    return lon_degrees, lat_degrees
+
+def get_moon_altitude_extrema(t):
+    # Altitudes la plus basse et la plus haute sur les 24 heures qui suivent t,
+    # d'une seule recherche
+    return altitude_extrema(resources.observer(), resources.ephemeris()['moon'], t,
+                            positions=resources.position_cache())
+
+def get_min_moon_altitude(t):
+    return get_moon_altitude_extrema(t)[0]
+
+def get_max_moon_altitude(t):
+    return get_moon_altitude_extrema(t)[1]
+
+def get_moon_phase(t):
+    phase_angle = get_moon_phase_angle(t)
+    illumination = get_moon_illumination(t)
+    if phase_angle < 45:
+        return "New Moon"
+    elif phase_angle < 135:
+        if illumination < 0.5:
+            return "First Quarter"
+        else:
+            return "Last Quarter"
+    elif phase_angle < 225:
+        return "Full Moon"
+    else:
+        if illumination < 0.5:
+            return "Last Quarter"
+        else:
+            return "First Quarter"
+        
+def get_lunar_eclipse(t0, t365):
+    t, y, details = resources.eclipse_catalog().between(t0, t365)
+    return t, y, details
+
+def get_moon_report(t):
+    """Returns the values printed by this script as a JSON-serializable dict."""
+    t0, _, t2, _ = get_day_bounds(t)
+    next_moonrise, next_moonset = get_next_moonrise_moonset(resources.location(), t0, t2, t)
+    alt, az, d = get_moon_altaz(t)
+    ra, dec, _ = get_moon_ra_dec(t)
+    libration_lon, libration_lat = get_moon_libration(t)
+    next_eclipse = resources.eclipse_catalog().next_after(t)
+    return {
+        "next_moonrise": next_moonrise.strftime('%Y-%m-%d %H:%M') if next_moonrise else None,
+        "next_moonset": next_moonset.strftime('%Y-%m-%d %H:%M') if next_moonset else None,
+        "altitude_degrees": alt.degrees,
+        "azimuth_degrees": az.degrees,
+        "distance_au": d.au,
+        "distance_km": d.km,
+        "right_ascension": ra.hours,
+        "declination": dec.degrees,
+        "phase_angle": get_moon_phase_angle(t),
+        "illumination": 100 - get_moon_illumination(t) * 100,
+        "libration_longitude": libration_lon,
+        "libration_latitude": libration_lat,
+        "phase": get_moon_phase(t),
+        "constellation": str(current_constellation('moon', t)),
+        "lunar_eclipse": {
+            "time": next_eclipse[0].utc_strftime('%Y-%m-%d %H:%M'),
+            "type": eclipselib.LUNAR_ECLIPSES[next_eclipse[1]],
+        } if next_eclipse else None,
+    }
+
+def main(argv=None):
+    t = resources.timescale().now()
+    t0, t1, t2, t365 = get_day_bounds(t)
+
+    # Obtenir les résultats de l'éclipse lunaire
+    times, types, details = get_lunar_eclipse(t0, t365)
+
+    # Afficher les résultats
+    eclipse_type_dict = {1: "Partielle", 2: "Totale"}
+    for i in range(len(times)):
+        print(f"Éclipse {i+1}:")
+        print(f"  Type: {eclipse_type_dict.get(types[i], 'Inconnu')}")
+        print(f"  Temps (UTC): {times[i].utc_strftime('%Y-%m-%d %H:%M')}")
+        print(f"  Approche la plus proche (radians): {details['closest_approach_radians'][i]}")
+        print(f"  Rayon de la lune (radians): {details['moon_radius_radians'][i]}")
+        print(f"  Rayon de la pénombre (radians): {details['penumbra_radius_radians'][i]}")
+        print(f"  Rayon de l'ombre (radians): {details['umbra_radius_radians'][i]}")
+        print(f"  Magnitude umbrale: {details['umbral_magnitude'][i]}")
+        print(f"  Magnitude pénumbrale: {details['penumbral_magnitude'][i]}")
+        print()
+
+    next_moonrise, next_moonset = get_next_moonrise_moonset(resources.location(), t0, t2, t)
+
+    print(f"Next Moonrise: {next_moonrise.strftime('%Y-%m-%d %H:%M')}")
+    print(f"Next Moonset: {next_moonset.strftime('%Y-%m-%d %H:%M')}")
+    print(f"Current Moon Altitude: {get_moon_altaz(t)[0].degrees} degrees")
+    print(f"Current Moon Azimuth: {get_moon_altaz(t)[1].degrees} degrees")
+    print(f"Curent Moon Distance: {get_moon_altaz(t)[2].au} AU / {get_moon_altaz(t)[2].km} km")
+    print(f"Current Moon RA: {get_moon_ra_dec(t)[0]}")
+    print(f"Current Moon Declination: {get_moon_ra_dec(t)[1].dstr(places=1, warn=True, format=u'{0}{1}° {2:02}′ {3:02}.{4:0{5}}″')}")
+    print(f"Current Moon Phase Angle: {get_moon_phase_angle(t)} degrees")
+    print(f"Current Moon Illumination: {100-get_moon_illumination(t)*100:.2f}%")
+    print(f"Current Moon Libration Longitude: {get_moon_libration(t)[0]:.3f} degrees")
+    print(f"Current Moon Libration Latitude: {get_moon_libration(t)[1]:.3f} degrees")
+    print(f"Current Moon Phase: {get_moon_phase(t)}")
+    print(f"Lunar Eclipse: {times[0].utc_strftime('%Y-%m-%d %H:%M')}, y={types[0]}, {eclipselib.LUNAR_ECLIPSES[types[0]]}")
+
+
+
+if __name__ == '__main__':
+    main()
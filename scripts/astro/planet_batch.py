@@ -0,0 +1,119 @@
+"""
+Positions of all the planets at once, from a single observer state.
+
+The observer's barycentric state is computed once (see ``Snapshot``); each
+planet is then observed from it, and every derived quantity (RA/Dec of
+date, alt/az, elongation, phase angle, illumination, constellation,
+magnitude, angular diameter and surface brightness) is
+computed on the stacked (3, N) array of position vectors instead of one
+planet at a time. The result is columnar: one NumPy array per quantity,
+in the order of ``names``.
+
+With ``accuracy_arcsec``, the positions come from the truncated VSOP87
+series of ``astro.vsop`` instead of the ephemeris, which is then not
+loaded (light time and annual aberration applied, no light deflection).
+"""
+import numpy as np
+from skyfield.functions import mxv, to_spherical
+
+from astro import resources, vsop
+from astro.constellations import constellation_of
+from astro.magnitudes import magnitudes
+from astro.snapshot import snapshot_at
+
+# Noms du flux Node-RED -> noms reconnus par Skyfield
+PLANETS = {
+    'mercury': 'mercury',
+    'venus': 'venus',
+    'mars': 'mars',
+    'jupiter': 'jupiter barycenter',
+    'saturn': 'saturn barycenter',
+    'uranus': 'uranus barycenter',
+    'neptune': 'neptune barycenter',
+    'pluto': 'pluto barycenter',
+}
+
+
+def _angle_between(u, v):
+    """Angle in degrees between the columns of two (3, N) arrays."""
+    cos_angle = np.sum(u * v, axis=0) / np.linalg.norm(u, axis=0) / np.linalg.norm(v, axis=0)
+    return np.degrees(np.arccos(np.clip(cos_angle, -1.0, 1.0)))
+
+
+def _aberration(position, velocity):
+    """Annual aberration, to first order, of (3, N) positions for an observer velocity (3,) in au/day."""
+    u = position / np.linalg.norm(position, axis=0)
+    beta = velocity[:, None] / vsop.AU_PER_DAY_C
+    return position + np.linalg.norm(position, axis=0) * (beta - u * np.sum(u * beta, axis=0))
+
+
+def _vsop_positions(t, names, accuracy_arcsec, location):
+    """Astrometric and apparent positions of the planets and of the Sun from the truncated VSOP87 series."""
+    if 'pluto' in names:
+        raise ValueError('pluto is not in the VSOP87 series')
+    series = vsop.series(accuracy_arcsec)
+    observer_au = location.at(t).position.au
+    astrometric = series.geocentric(names, t.tt, observer_au).T
+    sun_astrometric = -(series.heliocentric(['earth'], t.tt)[0] + observer_au)[:, None]
+    velocity = series.earth_velocity(t.tt)
+    return (astrometric, _aberration(astrometric, velocity),
+            sun_astrometric, _aberration(sun_astrometric, velocity))
+
+
+def planet_batch(t, names=tuple(PLANETS), refraction=True, accuracy_arcsec=None, location=None):
+    """
+    Parameters
+    ----------
+    t : Skyfield time (single instant)
+    names : planet names, keys of PLANETS
+    refraction : apply standard atmospheric refraction to the altitude
+    accuracy_arcsec : if given, compute the positions from the VSOP87 series
+        truncated to this accuracy (see ``astro.vsop``), without the ephemeris
+    location : wgs84 position of the observer, by default the one of the settings
+
+    Returns a dict of arrays, one value per planet in the order of names.
+    """
+    if location is None:
+        location = resources.location()
+    if accuracy_arcsec is not None:
+        astrometric, apparent, sun_astrometric, sun_apparent = _vsop_positions(t, list(names), accuracy_arcsec,
+                                                                               location)
+    else:
+        observer = resources.observer() if location is resources.location() \
+            else resources.ephemeris()['earth'] + location
+        snapshot = snapshot_at(resources.ephemeris(), observer, t)
+        bodies = [PLANETS[name] for name in names]
+        astrometric = np.column_stack([snapshot.astrometric(b).position.au for b in bodies])
+        apparent = np.column_stack([snapshot.apparent(b).position.au for b in bodies])
+        sun_astrometric = snapshot.astrometric('sun').position.au[:, None]
+        sun_apparent = snapshot.apparent('sun').position.au[:, None]
+
+    distance, dec_j2000, ra_j2000 = to_spherical(apparent)
+    _, dec, ra = to_spherical(mxv(t.M, apparent))  # équateur et équinoxe de la date
+    _, alt, az = to_spherical(mxv(location.rotation_at(t), apparent))
+    alt = np.degrees(alt)
+    if refraction:
+        alt = location.refract(alt, 'standard', 'standard').degrees
+
+    phase_angle = _angle_between(-astrometric, sun_astrometric - astrometric)
+    photometry = magnitudes(names, (astrometric - sun_astrometric).T[:, :, None], astrometric.T[:, :, None], t.J)
+    return {
+        'names': np.array(names),
+        'right_ascension': np.degrees(ra) / 15.0,
+        'declination': np.degrees(dec),
+        'distance_au': distance,
+        'elongation_degrees': _angle_between(apparent, sun_apparent),
+        'phase_angle': phase_angle,
+        'illumination': 50 * (1 + np.cos(np.radians(phase_angle))),  # pourcentage éclairé
+        'constellation': constellation_of(np.degrees(ra_j2000) / 15.0, np.degrees(dec_j2000)),
+        'altitude_degrees': alt,
+        'azimuth_degrees': np.degrees(az),
+        'magnitude': photometry['magnitude'][:, 0],
+        'angular_diameter': photometry['angular_diameter'][:, 0],
+        'surface_brightness': photometry['surface_brightness'][:, 0],
+    }
+
+
+def batch_to_json(batch):
+    """Returns the batch as a JSON-serializable dict of lists."""
+    return {key: values.tolist() for key, values in batch.items()}
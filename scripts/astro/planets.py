@@ -0,0 +1,118 @@
+"""
+Planet payload published to Home Assistant by the Node-RED flow.
+
+This is the computation of the ``solar_system_planets.py`` template of
+``Astronomy flux.json``, with the date and the observer passed as arguments
+so that a long-running process can call it on every tick. The observer,
+that of the settings by default, is used for the positions as well as for
+the events. The positions of all the planets, and their magnitudes, come
+from one ``planet_batch`` call; the perihelia and aphelia from the cached
+``ApsisCatalog``; astronomy-engine is kept for the other event searches
+(rise/set, conjunctions) and Pluto's apsides; rise, set and transit times
+are served by an ``EventScheduler`` and only searched again once they have
+passed.
+"""
+import astronomy
+from skyfield.api import load_constellation_names, wgs84
+
+from astro import resources
+from astro.apsides import PERIOD_DAYS
+from astro.earth_orientation import configure_astronomy_engine
+from astro.planet_batch import planet_batch
+from astro.scheduler import EventScheduler, observer_key
+
+# Observateur des réglages (Cherbourg)
+observer = resources.astronomy_observer()
+
+# Liste des planètes
+planets = [astronomy.Body.Mercury, astronomy.Body.Venus, astronomy.Body.Mars,
+           astronomy.Body.Jupiter, astronomy.Body.Saturn, astronomy.Body.Uranus,
+           astronomy.Body.Neptune, astronomy.Body.Pluto]
+
+# Abréviation -> nom complet, comme astronomy.Constellation(...).name
+constellation_names = dict(load_constellation_names())
+
+# Lever, coucher et culmination gardés en mémoire d'un appel à l'autre
+scheduler = EventScheduler()
+
+
+def _location(observer):
+    """wgs84 position of an astronomy-engine observer, the shared one for the observer of the settings."""
+    if observer_key(observer) == observer_key(resources.astronomy_observer()):
+        return resources.location()
+    return wgs84.latlon(observer.latitude, observer.longitude, elevation_m=observer.height)
+
+
+def get_planet_data(date=None, observer=observer):
+    """Returns the payload of the flow: one dict per planet, keyed by lower-case name."""
+    # Même Delta T que Skyfield, pour que les dates des deux bibliothèques coïncident
+    configure_astronomy_engine(resources.timescale())
+    if date is None:
+        date = astronomy.Time.Now()
+
+    # Positions de toutes les planètes en un seul calcul (date astronomy-engine -> Skyfield)
+    t = resources.timescale().tt_jd(date.tt + 2451545.0)
+    batch = planet_batch(t, [planet.name.lower() for planet in planets], location=_location(observer))
+
+    planet_data = {}
+    for i, planet in enumerate(planets):
+        try:
+            # Trouver les heures de lever et de coucher
+            rise = scheduler.rise(planet, observer, date, 1)
+            set = scheduler.set(planet, observer, date, 1)
+            transit = scheduler.transit(planet, observer, date)
+
+            # Calculer la conjonction inférieure pour Mercure et Vénus
+            if planet in [astronomy.Body.Mercury, astronomy.Body.Venus]:
+                inferior_conjunction = astronomy.SearchRelativeLongitude(planet, 0.0, date)
+            else:
+                # Calculer l'opposition pour les autres planètes
+                opposition = astronomy.SearchRelativeLongitude(planet, 180.0, date)
+
+            # Calculer la conjonction supérieure pour toutes les planètes
+            superior_conjunction = astronomy.SearchRelativeLongitude(planet, 0.0, date)
+
+            # Calculer le périhélie et l'aphélie
+            if planet.name.lower() in PERIOD_DAYS:
+                perihelion, aphelion = (astronomy.Time.FromTerrestrialTime(tt - 2451545.0) for tt in
+                                        resources.apsis_catalog().next_after(planet.name.lower(), date.tt + 2451545.0))
+            else:
+                apsis = astronomy.SearchPlanetApsis(planet, date)
+                apsis2 = astronomy.NextPlanetApsis(planet, apsis)
+
+                if apsis.dist_au > apsis2.dist_au:
+                    aphelion = apsis.time
+                    perihelion = apsis2.time
+                else:
+                    aphelion = apsis2.time
+                    perihelion = apsis.time
+
+            alt, az, distance = (float(batch['altitude_degrees'][i]), float(batch['azimuth_degrees'][i]),
+                                 float(batch['distance_au'][i]))
+
+            state = "ON" if alt > 0 else "OFF"
+
+            # Ajouter les données de la planète
+            planet_data[planet.name.lower()] = {
+                "right_ascension": float(batch['right_ascension'][i]),
+                "declination": float(batch['declination'][i]),
+                "distance_au": distance,
+                "elongation_degrees": float(batch['elongation_degrees'][i]),
+                "magnitude_apparente": float(batch['magnitude'][i]),
+                "phase_angle": float(batch['phase_angle'][i]),
+                "constellation": constellation_names[str(batch['constellation'][i])],
+                "altitude_degrees": alt,
+                "azimuth_degrees": az,
+                "heure_de_lever": str(rise),
+                "heure_de_coucher": str(set),
+                "heure_de_culmination": str(transit),
+                "conjunction_type": str(inferior_conjunction if planet in [astronomy.Body.Mercury, astronomy.Body.Venus] else opposition),
+                "conjonction_superieure": str(superior_conjunction),
+                "perihelie": str(perihelion),
+                "aphelie": str(aphelion),
+                "state": state
+            }
+        except Exception as e:
+            print(f"Error processing data for {planet.name}: {e}")
+
+    return planet_data
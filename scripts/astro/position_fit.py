@@ -0,0 +1,190 @@
+"""
+Per-day Chebyshev fits of the apparent positions seen by the observer.
+
+The apparent position of a body (light time, deflection and aberration
+applied) changes smoothly, yet each ``observe().apparent()`` evaluates the
+ephemeris several times. For each body and each TT day, ``PositionCache``
+samples the topocentric apparent position vector (GCRS axes, au) at the
+Chebyshev nodes of SEGMENTS equal parts of the day, fits one polynomial of
+degree DEGREE per part and coordinate, and checks the fit on a grid four
+times denser than the nodes: the number of parts is doubled until the
+largest error, relative to the distance, is below TOLERANCE_ARCSEC (this
+bounds both the angular error and the relative error on the distance).
+
+Queries then evaluate the polynomials and wrap the vector in a Skyfield
+``Apparent`` position centered on the observer's location, whose
+``altaz()`` and ``radec()`` are the usual ones. The fits of a day are kept
+in memory and in position_fits_<day>.npz of the cache folder, keyed by the
+observer and a hash of the ephemeris file, so that the scripts started
+every minute reuse them too.
+"""
+import contextlib
+import glob
+import os
+
+import numpy as np
+from numpy.polynomial import chebyshev
+from skyfield.positionlib import Apparent
+
+from astro.settings import cache_path
+
+DEGREE = 8
+SEGMENTS = 4  # parties de la journée au départ
+MAX_SEGMENTS = 256
+TOLERANCE_ARCSEC = 1.0
+VERIFY = 4  # points de vérification par nœud
+VERSION = 1
+
+ARCSEC = np.pi / 180 / 3600
+
+
+def _nodes(degree):
+    """Chebyshev nodes of the first kind on [-1, 1]."""
+    return np.cos(np.pi * (np.arange(degree + 1) + 0.5) / (degree + 1))
+
+
+class PositionFit:
+    """
+    Piecewise Chebyshev fit of one position vector over one day.
+
+    Parameters
+    ----------
+    coefficients : array (DEGREE + 1, 3, segments)
+    day : TT Julian date of the start of the day
+    error_arcsec : largest error found on the verification grid
+    """
+
+    def __init__(self, coefficients, day, error_arcsec):
+        self.coefficients = coefficients
+        self.day = day
+        self.error_arcsec = error_arcsec
+
+    @classmethod
+    def build(cls, position_au, day, degree=DEGREE, segments=SEGMENTS, tolerance=TOLERANCE_ARCSEC):
+        """
+        Fits position_au(tt) (tt: array of TT Julian dates, result: array
+        (3, n) in au) over the day starting at TT Julian date day.
+        """
+        nodes = _nodes(degree)
+        check = np.linspace(-1, 1, VERIFY * (degree + 1))
+        while True:
+            starts = day + np.arange(segments) / segments
+            tt = starts[None, :] + (nodes[:, None] + 1) / (2 * segments)
+            samples = position_au(tt.ravel()).reshape(3, degree + 1, segments)
+            coefficients = chebyshev.chebfit(nodes, samples.transpose(1, 0, 2).reshape(degree + 1, -1), degree)
+            fit = cls(coefficients.reshape(degree + 1, 3, segments), day, 0.0)
+
+            tt = (starts[None, :] + (check[:, None] + 1) / (2 * segments)).ravel()
+            exact = position_au(tt)
+            error = np.linalg.norm(fit.position_au(tt) - exact, axis=0) / np.linalg.norm(exact, axis=0)
+            fit.error_arcsec = float(error.max() / ARCSEC)
+            if fit.error_arcsec < tolerance or segments >= MAX_SEGMENTS:
+                return fit
+            segments *= 2
+
+    def position_au(self, tt):
+        """Fitted position (3, n) at the TT Julian dates tt, all inside the day."""
+        segments = self.coefficients.shape[2]
+        u = (np.asarray(tt, dtype=float) - self.day) * segments
+        index = np.clip(np.floor(u).astype(int), 0, segments - 1)
+        x = 2 * (u - index) - 1
+        return chebyshev.chebval(x, self.coefficients[:, :, index], tensor=False)
+
+
+class PositionCache:
+    """
+    Apparent positions of the bodies seen from one location, from the
+    per-day fits.
+
+    Parameters
+    ----------
+    eph : Skyfield ephemeris
+    location : wgs84 position of the observer
+    ts : Skyfield timescale
+    key : identity of the ephemeris and observer, stored with the fits
+    folder : folder of the fits files, by default the cache folder
+    """
+
+    def __init__(self, eph, location, ts, key, folder=None):
+        self.eph = eph
+        self.location = location
+        self.ts = ts
+        self.observer = eph['earth'] + location
+        self.key = repr((VERSION, DEGREE, TOLERANCE_ARCSEC, key))
+        self.folder = folder
+        self._fits = {}
+
+    def _path(self, day):
+        name = f'position_fits_{day}.npz'
+        return os.path.join(self.folder, name) if self.folder else cache_path(name)
+
+    def _target(self, body):
+        """NAIF code of a body given by its name or as a Skyfield body."""
+        return body.target if hasattr(body, 'target') else self.eph[body].target
+
+    def _position_function(self, target):
+        body = self.eph[target]
+
+        def position_au(tt):
+            return self.observer.at(self.ts.tt_jd(tt)).observe(body).apparent().position.au
+        return position_au
+
+    def _load_day(self, day):
+        """Fits of the day stored in its file, if they were made for this ephemeris and observer."""
+        try:
+            with np.load(self._path(day)) as f:
+                if str(f['key']) != self.key:
+                    return {}
+                return {int(name): PositionFit(f[name], day, float(f[name + '.error']))
+                        for name in f.files if name != 'key' and not name.endswith('.error')}
+        except (OSError, KeyError, ValueError):
+            return {}
+
+    def _save_day(self, day):
+        fits = {target: fit for (target, fit_day), fit in self._fits.items() if fit_day == day}
+        fits = {**self._load_day(day), **fits}
+        arrays = {'key': np.array(self.key)}
+        for target, fit in fits.items():
+            arrays[str(target)] = fit.coefficients
+            arrays[f'{target}.error'] = np.array(fit.error_arcsec)
+        path = self._path(day)
+        tmp = f'{path}.{os.getpid()}.tmp'
+        with open(tmp, 'wb') as f:
+            np.savez_compressed(f, **arrays)
+        os.replace(tmp, path)
+        # Les journées passées ne servent plus ; un autre processus peut les
+        # avoir déjà supprimées
+        for old in glob.glob(self._path('*')):
+            if float(old[:-len('.npz')].rsplit('_', 1)[1]) < day - 1:
+                with contextlib.suppress(FileNotFoundError):
+                    os.remove(old)
+
+    def fit(self, body, day):
+        """Fit of the body (name or Skyfield body) over the TT day starting at the Julian date day."""
+        target = self._target(body)
+        if (target, day) not in self._fits:
+            for key in [key for key in self._fits if key[1] < day - 1]:
+                del self._fits[key]
+            stored = self._load_day(day)
+            if target in stored:
+                self._fits[target, day] = stored[target]
+            else:
+                self._fits[target, day] = PositionFit.build(self._position_function(target), day)
+                self._save_day(day)
+        return self._fits[target, day]
+
+    def apparent(self, body, t):
+        """Apparent position of the body (name or Skyfield body) at t (scalar or array Time), from the fits."""
+        tt = np.asarray(t.tt, dtype=float)
+        days = np.floor(tt - 0.5) + 0.5
+        position = np.empty((3,) + tt.shape)
+        for day in np.unique(days):
+            inside = days == day
+            position[:, inside] = self.fit(body, float(day)).position_au(tt[inside])
+        return Apparent(position, None, t, self.location)
+
+    def altaz(self, body, t, temperature_C=None, pressure_mbar='standard'):
+        return self.apparent(body, t).altaz(temperature_C, pressure_mbar)
+
+    def radec(self, body, t, epoch=None):
+        return self.apparent(body, t).radec(epoch)
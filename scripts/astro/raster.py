@@ -0,0 +1,145 @@
+"""
+Phase discs drawn directly on a NumPy pixel grid, without matplotlib.
+
+The image is the one of ``render.PhaseFigure`` (limb, dark half and
+terminator ellipse on the background of the dashboard, three white texts),
+computed from the phase angle, the sunlit side and the apparent radius. The
+disc is drawn as a transparent sprite (``disc_sprite``) pasted on the
+background; its edges are anti-aliased from the distance of each pixel
+center to the edge. The texts are drawn with Pillow.
+"""
+import io
+import math
+
+import numpy as np
+from PIL import Image, ImageColor, ImageDraw, ImageFont
+
+POINT = 300 / 72  # pixels par point à 300 dpi
+FONT_SIZE = 10 * POINT
+SPINE_WIDTH = 0.8 * POINT  # cadre des axes de matplotlib
+BAND = 128  # lignes calculées ensemble
+
+
+def rgb(color):
+    """RGB array (0-1) of a color name or '#rrggbb', matplotlib's 'k' included."""
+    return np.array(ImageColor.getrgb('black' if color == 'k' else color), dtype=np.float32) / 255
+
+
+def _coverage(distance):
+    """Fraction of a pixel covered, from the signed distance (pixels) of its center to the edge."""
+    return np.clip(0.5 - distance, 0.0, 1.0)
+
+
+def _ellipse_distance(x, y, a, b):
+    """Approximate signed distance (pixels) to the ellipse of semi-axes a (x) and b (y)."""
+    a = max(a, 1e-6)
+    f = (x / a) ** 2 + (y / b) ** 2 - 1
+    gradient = 2 * np.hypot(x / a ** 2, y / b ** 2)
+    return f / np.maximum(gradient, 1e-12)
+
+
+def sprite_size(radius_px, linewidth_px):
+    """Side in pixels of the sprite of a disc, limb included."""
+    return 2 * math.ceil(radius_px + linewidth_px / 2 + 2)
+
+
+def disc_sprite(radius_px, b_px, left, color, terminator_color, dark_color, linewidth_px, center=None):
+    """
+    RGBA image (uint8, transparent around the disc) of a disc of radius
+    radius_px, whose terminator ellipse has the half small axis b_px, lit from
+    the left if left is true. The colors are names or '#rrggbb'. The center of
+    the disc is at center pixels from the top left corner, by default the
+    middle of the sprite.
+    """
+    size = sprite_size(radius_px, linewidth_px)
+    center = size / 2 if center is None else center
+    centers = (np.arange(size) + 0.5 - center).astype(np.float32)
+    x = centers[None, :]
+    colors = [rgb(color), rgb('black'), rgb(dark_color), rgb(terminator_color)]
+    sprite = np.empty((size, size, 4), np.uint8)
+    for start in range(0, size, BAND):
+        rows = slice(start, min(start + BAND, size))
+        y = -centers[rows, None]
+        r = np.hypot(x, y)
+        inside = _coverage(r - radius_px)
+        coverages = (
+            inside,  # disque
+            _coverage(np.abs(r - radius_px) - linewidth_px / 2),  # bord noir, centré sur le rayon
+            inside * _coverage(-x if left else x),  # moitié sombre, à droite si éclairé par la gauche
+            _coverage(_ellipse_distance(x, y, abs(b_px), radius_px)),  # terminateur, par-dessus
+        )
+        # Couleurs prémultipliées par l'opacité, couche après couche
+        premultiplied = np.zeros((rows.stop - rows.start, size, 3), np.float32)
+        alpha = np.zeros((rows.stop - rows.start, size, 1), np.float32)
+        for layer_color, coverage in zip(colors, coverages):
+            coverage = coverage[..., None]
+            premultiplied += coverage * (layer_color - premultiplied)
+            alpha += coverage * (1 - alpha)
+        sprite[rows, :, :3] = premultiplied / np.maximum(alpha, 1e-6) * 255 + 0.5
+        sprite[rows, :, 3:] = alpha * 255 + 0.5
+    return sprite
+
+
+class RasterPhaseFigure:
+    """
+    Same interface as ``render.PhaseFigure``: ``update(inputs)`` then
+    ``png()`` or ``rgba()``.
+
+    Parameters
+    ----------
+    size : width and height of the image in pixels, the axes spanning -1 to 1
+    dark_color : color of the unlit half
+    linewidth : width of the limb, in points
+    font : path of a TrueType font, or None for the default font of Pillow
+    background : color outside the disc
+    """
+
+    def __init__(self, size, dark_color, linewidth, font, background):
+        self.size = size
+        self.dark_color = dark_color
+        self.linewidth = linewidth * POINT
+        if font:
+            self.font = ImageFont.truetype(font, round(FONT_SIZE))
+        else:
+            self.font = ImageFont.load_default(round(FONT_SIZE))
+        # Fond et cadre des axes, qui ne changent pas
+        distance = np.float32(size / 2) - np.abs(np.arange(size, dtype=np.float32) + 0.5 - size / 2)
+        spine = np.clip(SPINE_WIDTH / 2 + 1.2 - np.minimum.outer(distance, distance), 0.0, 1.0)
+        base = rgb(background) * (1 - spine[..., None]) * 255 + 0.5
+        self.base = Image.fromarray(base.astype(np.uint8), 'RGB')
+        self.image = None
+
+    def sprite(self, radius_px, b_px, left, color, terminator_color):
+        """
+        Image of the disc centered on the image (see disc_sprite), and the
+        position of its top left corner in the image.
+        """
+        # Le disque (rayon < 1) ne déborde jamais du cadre ; son centre tombe
+        # au milieu de l'image, entre deux pixels si sa taille est impaire
+        scale = self.size / 2
+        corner = math.floor(scale - sprite_size(radius_px, self.linewidth) / 2)
+        sprite = disc_sprite(radius_px, b_px, left, color, terminator_color,
+                             self.dark_color, self.linewidth, scale - corner)
+        return Image.fromarray(sprite, 'RGBA'), corner
+
+    def update(self, inputs):
+        """Draws the image described by ``render.phase_inputs()``."""
+        radius, b, left, color, terminator_color, percent, angle, date = inputs
+        scale = self.size / 2  # pixels par unité des axes
+        sprite, corner = self.sprite(radius * scale, b * scale, left, color, terminator_color)
+        picture = self.base.copy()
+        picture.paste(sprite, (corner, corner), sprite)
+        draw = ImageDraw.Draw(picture)
+        margin = 0.02 * self.size
+        draw.text((self.size - margin, margin), percent, fill='white', font=self.font, anchor='ra')
+        draw.text((margin, margin), angle, fill='white', font=self.font, anchor='la')
+        draw.text((self.size / 2, self.size - margin), date, fill='white', font=self.font, anchor='md')
+        self.image = picture
+
+    def rgba(self, pad_inches=0):
+        return np.asarray(self.image)
+
+    def png(self, pad_inches=0, dpi=300):
+        buffer = io.BytesIO()
+        self.image.save(buffer, format='PNG', dpi=(dpi, dpi))
+        return buffer.getvalue()
@@ -0,0 +1,531 @@
+"""
+Dashboard images: phases and heliocentric positions of the planets, phase of
+the Moon.
+
+The drawings are those of ``img_planets_phases.py``, ``img_planets_positions.py``
+and ``img_moon_phase.py`` (David ALBERTO, www.astrolabe-science.fr), made in a
+single run: the state of every body is computed once, then one figure per kind
+of image is built and its artists are updated for each body before saving::
+
+    python -m astro images [--workers 4] [--mqtt localhost] [--output images/]
+
+The PNG images are encoded in memory and handed to sinks: files of the
+images folder (``FileSink``, written then renamed so that a reader never
+sees half a file) and/or retained MQTT messages for the image entities of
+Home Assistant (``MqttSink``). With ``--mqtt``, files are only written if
+``--output`` is given.
+
+With ``--workers``, matplotlib only rasterizes the figures; the PNG encoding,
+which takes most of the time at 300 dpi, is done by a pool of processes.
+
+The phase discs are drawn by ``astro.raster`` (NumPy and Pillow), copied
+from the pre-rendered atlases of ``astro.atlas`` with ``--backend atlas`` or
+drawn by matplotlib with ``--backend matplotlib``; the positions are
+matplotlib polar plots. Drawing a disc directly costs a few milliseconds,
+about what the atlas saves, so the atlases are not the default.
+
+What each image shows is first rounded to the precision of the display and
+hashed; an image whose hash has not changed since it was last written is
+neither drawn nor written again.
+"""
+import argparse
+import functools
+import hashlib
+import io
+import json
+import locale
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+from skyfield.framelib import ecliptic_frame
+
+from astro import resources, settings
+from astro.atlas import AtlasPhaseFigure
+from astro.fonts import resolve_fonts
+from astro.raster import RasterPhaseFigure
+
+DPI = 300
+BACKGROUND_COLOR = '#282624'  # Fluent Orange Theme (card-background-color: "rgb(40,38,36)")
+LINE_COLOR = '#464039'
+MOON_COLOR = 'lightgray'
+PLANET_COLORS = {'mercury': 'gray', 'venus': 'tan', 'earth': 'royalblue', 'mars': 'orangered',
+                 'jupiter barycenter': 'orange', 'saturn barycenter': 'goldenrod',
+                 'uranus barycenter': 'skyblue', 'neptune barycenter': 'mediumblue'}
+PLANET_NAMES = ['mercury', 'venus', 'mars', 'jupiter barycenter', 'saturn barycenter',
+                'uranus barycenter', 'neptune barycenter']  # noms Skyfield
+KINDS = ('phases', 'positions', 'moon')
+BACKENDS = ('raster', 'atlas', 'matplotlib')
+PHASE_SIZE = 1155  # côté en pixels des images de phase des planètes (axes de 5 pouces à 300 dpi)
+MOON_SIZE = 1500  # image de la Lune : les axes occupent toute la figure
+
+
+@functools.lru_cache(maxsize=None)
+def setup_style():
+    """
+    French month names, set once per process.
+
+    Returns the fonts of the planet and Moon images as (family, path) pairs,
+    see ``fonts.resolve_fonts``.
+    """
+    try:
+        locale.setlocale(locale.LC_ALL, 'fr_FR.UTF-8')  # noms des mois en français
+    except locale.Error:
+        pass
+    return resolve_fonts()
+
+
+def _lightside(lon_sun, lon_body):
+    """True if sunlight comes from the left, from the geocentric ecliptic longitudes (degrees)."""
+    long_diff = (lon_sun - lon_body + 180) % 360 - 180
+    return long_diff >= 0
+
+
+def _phase(eph, body, t):
+    """Phase angle in degrees (vertex at the body) and percent illuminated."""
+    body_position = eph[body].at(t)
+    phase_angle = body_position.observe(eph['sun']).separation_from(
+        body_position.observe(eph['earth'])).degrees
+    return phase_angle, 50 * (1 + np.cos(np.radians(phase_angle)))
+
+
+def body_states(t, eph=None):
+    """
+    Everything the images need at time t, computed once.
+
+    Returns a dict keyed by Skyfield name ('moon' and the planets of
+    PLANET_NAMES) of dicts with keys phase, illuminated (percent), left
+    (sunlit side), distance (au, from the Earth), and for the planets and
+    'earth' helio_longitude (radians) and helio_distance (au).
+    """
+    eph = eph or resources.ephemeris()
+    earth, sun = eph['earth'], eph['sun']
+    earth_position = earth.at(t)
+    sun_position = sun.at(t)
+    lon_sun = earth_position.observe(sun).frame_latlon(ecliptic_frame)[1].degrees
+
+    states = {}
+    for name in ['moon'] + PLANET_NAMES:
+        phase, illuminated = _phase(eph, name, t)
+        lat, lon, distance = earth_position.observe(eph[name]).frame_latlon(ecliptic_frame)
+        states[name] = {
+            'phase': phase,
+            'illuminated': illuminated,
+            'left': _lightside(lon_sun, lon.degrees),
+            'distance': distance.au,
+        }
+    for name in ['earth'] + PLANET_NAMES:
+        lat, lon, distance = sun_position.observe(eph[name]).frame_latlon(ecliptic_frame)
+        states.setdefault(name, {}).update(helio_longitude=lon.radians, helio_distance=distance.au)
+    return states
+
+
+def phase_inputs(radius, phase, illuminated, left, color, date_label):
+    """
+    What a phase image shows for a disc of the given radius, phase angle
+    (degrees) and body color, rounded to the precision of the display.
+    """
+    b = radius * np.cos(np.radians(phase))  # demi petit axe de l'ellipse du terminateur
+    # Les axes font 2 unités pour plus de 1000 pixels : 1e-3 est sous le pixel
+    return (round(radius, 3), round(b, 3), bool(left), color,
+            color if 0 <= phase < 90 else 'black',
+            f'{round(illuminated, 2)} %', f'phase angle: {round(phase, 1)}°', date_label)
+
+
+class _MatplotlibFigure:
+    """PNG or RGBA pixels of self.fig, cropped to its content."""
+
+    def png(self, pad_inches=0):
+        buffer = io.BytesIO()
+        self.fig.savefig(buffer, format='png', dpi=DPI, bbox_inches='tight', pad_inches=pad_inches)
+        return buffer.getvalue()
+
+    def rgba(self, pad_inches=0):
+        sink = _RGBASink()
+        self.fig.savefig(sink, format='rgba', dpi=DPI, bbox_inches='tight', pad_inches=pad_inches)
+        return sink.image
+
+
+class PhaseFigure(_MatplotlibFigure):
+    """
+    Aspect of a disc, its percent illuminated and phase angle, drawn with
+    matplotlib patches.
+
+    Parameters
+    ----------
+    dark_color : color of the unlit half ('k' for the planets, the background for the Moon)
+    linewidth : width of the limb
+    font : font family of the texts
+    """
+
+    def __init__(self, dark_color='k', linewidth=0.5, font="DejaVu Sans"):
+        from matplotlib import rc_context
+
+        with rc_context({"font.family": font}):
+            self._build(dark_color, linewidth)
+
+    def _build(self, dark_color, linewidth):
+        from matplotlib import patches
+        from matplotlib.figure import Figure
+
+        self.fig = Figure(figsize=(5, 5))
+        self.ax = ax = self.fig.add_subplot()
+        ax.set(aspect='equal', xlim=(-1, 1), ylim=(-1, 1), xticks=([]), yticks=([]),
+               facecolor=BACKGROUND_COLOR)
+        self.limb = patches.Circle((0, 0), 1, edgecolor='k', zorder=0, linewidth=linewidth)
+        self.dark_half = patches.Wedge((0, 0), 1, -90, 90, color=dark_color, ec='None')
+        self.terminator = patches.Ellipse((0, 0), 1, 2, lw=0)
+        for patch in (self.limb, self.dark_half, self.terminator):
+            ax.add_patch(patch)
+        self.percent = ax.text(0.98, 0.98, '', ha='right', va='top', fontsize=10, c='white',
+                               transform=ax.transAxes)
+        self.angle = ax.text(0.02, 0.98, '', ha='left', va='top', fontsize=10, c='white',
+                             transform=ax.transAxes)
+        self.date = ax.text(0.5, 0.02, '', ha='center', va='bottom', fontsize=10, c='white',
+                            transform=ax.transAxes)
+
+    def update(self, inputs):
+        """Draws the image described by ``phase_inputs()``."""
+        radius, b, left, color, terminator_color, percent, angle, date = inputs
+        self.limb.set_radius(radius)
+        self.limb.set_facecolor(color)
+        self.dark_half.set_radius(radius)
+        if left:
+            self.dark_half.set_theta1(-90)
+            self.dark_half.set_theta2(90)
+        else:
+            self.dark_half.set_theta1(90)
+            self.dark_half.set_theta2(270)
+        self.terminator.set_width(2 * b)
+        self.terminator.set_height(2 * radius)
+        self.terminator.set_color(terminator_color)
+        self.percent.set_text(percent)
+        self.angle.set_text(angle)
+        self.date.set_text(date)
+
+
+class PositionFigure(_MatplotlibFigure):
+    """Heliocentric positions of the Earth and of one planet, seen from the ecliptic pole."""
+
+    def __init__(self, font="DejaVu Sans"):
+        from matplotlib.figure import Figure
+
+        self.font = font
+        self.fig = Figure()
+        self.fig.patch.set_facecolor(BACKGROUND_COLOR)
+        self.ax = ax = self.fig.add_subplot(122, projection='polar')
+        ax.set(xticks=([]), yticks=([]), facecolor=BACKGROUND_COLOR)
+        ax.spines['polar'].set_color(LINE_COLOR)
+        self.lines = [ax.plot([], [], c=LINE_COLOR, lw=0.7)[0] for _ in range(3)]
+        ax.scatter(0, 0, c='gold', s=100, zorder=2, edgecolors=LINE_COLOR)
+        self.earth = ax.scatter(0, 0, label='Terre', c=PLANET_COLORS['earth'], zorder=2,
+                                edgecolors=LINE_COLOR)
+        self.planet = ax.scatter(0, 0, zorder=2, edgecolors=LINE_COLOR)
+
+    def inputs(self, earth, planet, name):
+        """
+        What the image shows, earth and planet being (longitude in radians,
+        distance in au), rounded to the precision of the display.
+        """
+        # Le graphique est mis à l'échelle de la plus grande distance, seuls
+        # les rapports comptent ; son rayon fait quelques centaines de pixels,
+        # 1e-3 radian ou 1e-3 de l'échelle est sous le pixel
+        scale = max(earth[1], planet[1])
+        earth = round(earth[0], 3), round(earth[1] / scale, 3)
+        planet = round(planet[0], 3), round(planet[1] / scale, 3)
+        return earth, planet, name
+
+    def update(self, inputs):
+        """Draws the image described by ``inputs()``."""
+        earth, planet, name = inputs
+        sun_earth, sun_planet, planet_earth = self.lines
+        sun_earth.set_data([0, earth[0]], [0, earth[1]])
+        sun_planet.set_data([0, planet[0]], [0, planet[1]])
+        planet_earth.set_data([planet[0], earth[0]], [planet[1], earth[1]])
+        self.earth.set_offsets([earth])
+        self.planet.set_offsets([planet])
+        self.planet.set_facecolor(PLANET_COLORS[name])
+        self.planet.set_label(name.capitalize())
+        self.ax.relim()
+        self.ax.autoscale_view()
+        from matplotlib import rc_context
+
+        with rc_context({"font.family": self.font, "font.size": 8}):
+            self.ax.legend(loc=1, facecolor='#908c88', edgecolor='#1b1a18', labelcolor='#1b1a18')
+
+
+class _RGBASink:
+    """File-like object keeping the RGBA buffer written by savefig(format='rgba')."""
+
+    def write(self, data):
+        self.image = np.array(data)  # memoryview (hauteur, largeur, 4) du renderer Agg
+
+    def seek(self, offset, whence=0):  # requis pour être reconnu comme fichier par matplotlib
+        return 0
+
+
+def _encode_png(image, dpi):
+    from PIL import Image
+
+    buffer = io.BytesIO()
+    Image.fromarray(image).save(buffer, format='PNG', dpi=(dpi, dpi))
+    return buffer.getvalue()
+
+
+class _Encoder:
+    """Encodes figures to PNG in memory, directly or in a process pool."""
+
+    def __init__(self, workers=0):
+        self.pool = ProcessPoolExecutor(workers) if workers else None
+        self.pending = []
+
+    def encode(self, name, figure, pad_inches):
+        if self.pool is None:
+            self.pending.append((name, figure.png(pad_inches)))
+        else:
+            self.pending.append((name, self.pool.submit(_encode_png, figure.rgba(pad_inches), DPI)))
+
+    def results(self):
+        """Yields (name, PNG bytes) in the order of encode()."""
+        for name, data in self.pending:
+            yield name, data if self.pool is None else data.result()
+
+    def close(self):
+        if self.pool is not None:
+            self.pool.shutdown()
+
+
+class FileSink:
+    """
+    Writes the images in a folder, created if needed; a file is replaced
+    only once completely written.
+    """
+
+    def __init__(self, image_dir=None):
+        self.image_dir = image_dir or settings.IMAGE_DIR
+
+    def target(self, name):
+        return os.path.join(self.image_dir, name)
+
+    def missing(self, name):
+        return not os.path.exists(self.target(name))
+
+    def write(self, name, data):
+        os.makedirs(self.image_dir, exist_ok=True)
+        path = self.target(name)
+        tmp = f'{path}.{os.getpid()}.tmp'
+        with open(tmp, 'wb') as f:
+            f.write(data)
+        os.replace(tmp, path)
+
+    def flush(self):
+        """Nothing to wait for, the files are written synchronously."""
+
+
+class MqttSink:
+    """
+    Publishes the images, retained, on <topic_prefix>/images/<name> for the
+    MQTT image entities of Home Assistant, announced by MQTT discovery.
+
+    Parameters
+    ----------
+    client : connected paho-mqtt client, see astro.daemon.mqtt_client
+    """
+
+    def __init__(self, client, topic_prefix='astronomy', discovery_prefix='homeassistant'):
+        self.client = client
+        self.topic_prefix = topic_prefix
+        self.discovery_prefix = discovery_prefix
+        self.announced = set()
+        self.pending = []
+
+    def topic(self, name):
+        return f"{self.topic_prefix}/images/{os.path.splitext(name)[0].replace(' ', '_')}"
+
+    def target(self, name):
+        return 'mqtt:' + self.topic(name)
+
+    def missing(self, name):
+        return False  # les messages sont retenus par le broker
+
+    def write(self, name, data):
+        if self.discovery_prefix and name not in self.announced:
+            object_id = self.topic(name).replace('/', '_')
+            config = {
+                "name": os.path.splitext(name)[0].replace('_', ' ').capitalize(),
+                "unique_id": object_id,
+                "image_topic": self.topic(name),
+                "content_type": "image/png",
+            }
+            self.client.publish(f'{self.discovery_prefix}/image/{object_id}/config',
+                                json.dumps(config), retain=True)
+            self.announced.add(name)
+        self.pending.append(self.client.publish(self.topic(name), data, retain=True))
+
+    def flush(self, timeout=10):
+        """Waits until the published images have left the client."""
+        for info in self.pending:
+            info.wait_for_publish(timeout)
+        self.pending = []
+
+
+class ImageHashes:
+    """
+    Hash of what each image shows, per destination (file or MQTT topic),
+    kept in image_hashes.json of the cache folder.
+    """
+
+    def __init__(self, path=None):
+        self.path = path or settings.cache_path('image_hashes.json')
+        try:
+            with open(self.path) as f:
+                self.hashes = json.load(f)
+        except (OSError, ValueError):
+            self.hashes = {}
+
+    @staticmethod
+    def digest(inputs):
+        return hashlib.sha1(repr(inputs).encode('utf-8')).hexdigest()
+
+    def changed(self, target, inputs):
+        """True if target was last written for other inputs."""
+        return self.hashes.get(target) != self.digest(inputs)
+
+    def update(self, target, inputs):
+        self.hashes[target] = self.digest(inputs)
+
+    def save(self):
+        tmp = f'{self.path}.{os.getpid()}.tmp'
+        with open(tmp, 'w') as f:
+            json.dump(self.hashes, f, indent=1, sort_keys=True)
+        os.replace(tmp, self.path)
+
+
+def render_all(t=None, image_dir=None, kinds=KINDS, workers=0, force=False, sinks=None,
+               backend='raster'):
+    """
+    Renders the images of the given kinds ('phases', 'positions', 'moon') at time t,
+    the phase discs with the given backend ('raster', 'atlas' or 'matplotlib').
+
+    The PNG images are encoded in memory and handed to the sinks, by default
+    a FileSink writing in image_dir. Images showing the same thing as when
+    they were last sent to every sink are skipped, unless force is true.
+    The sinks are flushed before returning. Returns the names of the images
+    sent.
+    """
+    planet_font, moon_font = setup_style()
+    if t is None:
+        t = resources.timescale().now()
+    if sinks is None:
+        sinks = [FileSink(image_dir)]
+    date = t.astimezone(resources.timezone())
+    states = body_states(t)
+    hashes = ImageHashes()
+    encoder = _Encoder(workers)
+    keys = {}
+
+    def phase_figure(size, dark_color, linewidth, font):
+        if backend == 'atlas':
+            return AtlasPhaseFigure(size, dark_color, linewidth, font[1], BACKGROUND_COLOR)
+        if backend == 'raster':
+            return RasterPhaseFigure(size, dark_color, linewidth, font[1], BACKGROUND_COLOR)
+        figure = PhaseFigure(dark_color, linewidth, font[0])
+        if size == MOON_SIZE:
+            figure.fig.subplots_adjust(left=0, right=1, top=1, bottom=0)
+        return figure
+
+    def render(figure, inputs, name, font, pad_inches=0):
+        key = (font[0], DPI, pad_inches, inputs)
+        if name.endswith('_phase.png'):
+            key = (backend,) + key
+        if not force and not any(hashes.changed(sink.target(name), key) or sink.missing(name)
+                                 for sink in sinks):
+            return
+        figure.update(inputs)
+        encoder.encode(name, figure, pad_inches)
+        keys[name] = key
+
+    try:
+        if 'phases' in kinds:
+            figure = phase_figure(PHASE_SIZE, 'k', 0.5, planet_font)
+            for name in PLANET_NAMES:
+                state = states[name]
+                inputs = phase_inputs(0.25 / state['distance'], state['phase'], state['illuminated'],
+                                      state['left'], PLANET_COLORS[name], date.strftime('%d %b %Y'))
+                render(figure, inputs, f'{name}_phase.png', planet_font)
+
+        if 'positions' in kinds:
+            figure = PositionFigure(font=planet_font[0])
+            earth = states['earth']['helio_longitude'], states['earth']['helio_distance']
+            for name in PLANET_NAMES:
+                state = states[name]
+                inputs = figure.inputs(earth, (state['helio_longitude'], state['helio_distance']), name)
+                render(figure, inputs, f'{name}_position.png', planet_font, pad_inches=0.05)
+
+        if 'moon' in kinds:
+            figure = phase_figure(MOON_SIZE, BACKGROUND_COLOR, 1, moon_font)
+            state = states['moon']
+            # Heure à la minute, la période de rendu : avec les secondes, l'image
+            # changerait à chaque fois
+            inputs = phase_inputs(0.00201 / state['distance'], state['phase'], state['illuminated'],
+                                  state['left'], MOON_COLOR, date.strftime('%d %b %Y %H:%M'))
+            render(figure, inputs, 'moon_phase.png', moon_font)
+
+        sent = []
+        for name, data in encoder.results():
+            for sink in sinks:
+                sink.write(name, data)
+                hashes.update(sink.target(name), keys[name])
+            sent.append(name)
+    finally:
+        encoder.close()
+        # Sans attente, les messages MQTT s'accumuleraient dans MqttSink.pending
+        for sink in sinks:
+            sink.flush()
+        hashes.save()
+    return sent
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog='python -m astro images',
+                                     description='Images du tableau de bord (phases et positions).')
+    parser.add_argument('kinds', nargs='*', metavar='kind',
+                        help=f"images à produire parmi {', '.join(KINDS)} (toutes par défaut)")
+    parser.add_argument('--output', help=f'dossier des images (défaut : {settings.IMAGE_DIR}, '
+                                         'sans --mqtt)')
+    parser.add_argument('--mqtt', metavar='HOST', help='publie les images sur ce broker MQTT')
+    parser.add_argument('--mqtt-port', type=int, default=1883)
+    parser.add_argument('--topic-prefix', default='astronomy')
+    parser.add_argument('--workers', type=int, default=0,
+                        help="processus pour l'encodage PNG (0 : aucun)")
+    parser.add_argument('--force', action='store_true',
+                        help='redessine aussi les images inchangées')
+    parser.add_argument('--backend', choices=BACKENDS, default='raster',
+                        help='dessin des disques de phase (défaut : NumPy et Pillow)')
+    args = parser.parse_args(argv)
+    unknown = set(args.kinds) - set(KINDS)
+    if unknown:
+        parser.error(f"images inconnues : {', '.join(sorted(unknown))}")
+
+    sinks = []
+    mqtt_sink = None
+    if args.mqtt:
+        from astro.daemon import mqtt_client
+
+        mqtt_sink = MqttSink(mqtt_client(args.mqtt, args.mqtt_port), args.topic_prefix)
+        sinks.append(mqtt_sink)
+    if args.output or not args.mqtt:
+        sinks.append(FileSink(args.output))
+    try:
+        sent = render_all(kinds=args.kinds or KINDS, workers=args.workers, force=args.force,
+                          sinks=sinks, backend=args.backend)
+    finally:
+        if mqtt_sink is not None:
+            mqtt_sink.client.disconnect()
+            mqtt_sink.client.loop_stop()
+    for name in sent:
+        print(name)  # seules les images modifiées
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,124 @@
+"""
+Lazily loaded, memoized resources.
+
+Nothing is loaded when this module is imported: the timescale, the DE421
+ephemeris, the lunar frame, the constellation map and the caches are
+built the first time a function asks for them, then kept for the life of
+the process. A long-lived host (the resident service) pays for each
+resource once, and only for the ones its calls actually touch.
+"""
+import atexit
+import functools
+
+import pytz
+from skyfield.api import load, load_constellation_map, load_file, wgs84, PlanetaryConstants
+
+from astro import settings
+
+
+@functools.lru_cache(maxsize=None)
+def timescale():
+    """Timescale from the local IERS file (see ``astro.earth_orientation``), never downloaded here."""
+    from astro.earth_orientation import timescale
+    return timescale()
+
+
+@functools.lru_cache(maxsize=None)
+def full_ephemeris():
+    return load(settings.EPHEMERIS)
+
+
+@functools.lru_cache(maxsize=None)
+def ephemeris():
+    """Excerpt of the ephemeris around the current year, or the full file if disabled in the settings."""
+    if not settings.EPHEMERIS_EXCERPT:
+        return full_ephemeris()
+    from astro.excerpt import current_excerpt
+    return load_file(current_excerpt())
+
+
+@functools.lru_cache(maxsize=None)
+def location():
+    """wgs84 position of the observer."""
+    return wgs84.latlon(settings.LATITUDE, settings.LONGITUDE, elevation_m=settings.ELEVATION)
+
+
+@functools.lru_cache(maxsize=None)
+def observer():
+    """Observer as a Skyfield vector sum (earth + location)."""
+    return ephemeris()['earth'] + location()
+
+
+@functools.lru_cache(maxsize=None)
+def astronomy_observer():
+    """The same observer for astronomy-engine."""
+    import astronomy
+    return astronomy.Observer(settings.LATITUDE, settings.LONGITUDE, settings.ELEVATION)
+
+
+@functools.lru_cache(maxsize=None)
+def timezone():
+    return pytz.timezone(settings.TIMEZONE)
+
+
+@functools.lru_cache(maxsize=None)
+def moon_binary_kernel():
+    """
+    Binary lunar kernel, excerpted like the ephemeris, as an open file: the
+    frame reads its segments on demand, so it stays open until the process
+    exits.
+    """
+    if settings.EPHEMERIS_EXCERPT:
+        from astro.excerpt import current_excerpt
+        f = open(current_excerpt(settings.MOON_BINARY_KERNEL, targets=None), 'rb')
+    else:
+        f = load(settings.MOON_BINARY_KERNEL)
+    atexit.register(f.close)
+    return f
+
+
+@functools.lru_cache(maxsize=None)
+def moon_frame():
+    """MOON_ME_DE421 frame, built from the bundled lunar kernels."""
+    pc = PlanetaryConstants()
+    for kernel in settings.MOON_TEXT_KERNELS:
+        with load(kernel) as f:
+            pc.read_text(f)
+    pc.read_binary(moon_binary_kernel())
+    return pc.build_frame_named('MOON_ME_DE421')
+
+
+@functools.lru_cache(maxsize=None)
+def constellation_map():
+    return load_constellation_map()
+
+
+@functools.lru_cache(maxsize=None)
+def event_cache():
+    from astro.event_cache import EventCache
+    return EventCache()
+
+
+@functools.lru_cache(maxsize=None)
+def position_cache():
+    """Per-day fits of the apparent positions seen by the observer, or None if disabled in the settings."""
+    if not settings.POSITION_FITS:
+        return None
+    from astro.earth_orientation import identity
+    from astro.event_cache import observer_key
+    from astro.position_fit import PositionCache
+    eph = ephemeris()
+    key = (observer_key(location()), event_cache().file_hash(eph.path), identity())
+    return PositionCache(eph, location(), timescale(), key)
+
+
+@functools.lru_cache(maxsize=None)
+def apsis_catalog():
+    from astro.apsides import ApsisCatalog
+    return ApsisCatalog()
+
+
+@functools.lru_cache(maxsize=None)
+def eclipse_catalog():
+    from astro.eclipses import EclipseCatalog
+    return EclipseCatalog(full_ephemeris(), event_cache=event_cache())
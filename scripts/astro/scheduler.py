@@ -0,0 +1,112 @@
+"""
+Next rise, set and transit of each body, kept in memory until they happen.
+
+The answer of ``astronomy.SearchRiseSet`` only changes when the event it
+returns has passed, so a process ticking every minute does not need to search
+again at each tick. An ``EventScheduler`` searches once per body and event,
+serves the cached time while it is still in the future and searches again
+once it has passed or when the observer changes.
+
+The same mechanism gives the next horizon crossing of each body, which lets
+the binary sensors of Home Assistant be switched at the exact instant
+instead of being polled.
+"""
+import astronomy
+from skyfield.earthlib import refraction
+
+# Fenêtre de recherche, plus large que celle demandée pour que « pas
+# d'événement dans les prochaines 24 h » reste valable pendant un moment
+SEARCH_DAYS = 3.0
+
+# Altitude géométrique du centre quand l'altitude réfractée est nulle,
+# avec la réfraction « standard » de Skyfield (10 °C, 1010 hPa) utilisée pour
+# l'état ON/OFF du payload des planètes
+HORIZON_ALTITUDE = -refraction(0.0, 10.0, 1010.0)
+
+
+def observer_key(observer):
+    """Hashable identity of an astronomy-engine observer."""
+    return observer.latitude, observer.longitude, observer.height
+
+
+class EventScheduler:
+    """Memoizes the next rise, set and transit of each body for one observer."""
+
+    def __init__(self, search_days=SEARCH_DAYS):
+        self.search_days = search_days
+        self._observer = None
+        self._events = {}
+
+    def _next(self, key, observer, date, search):
+        """Next event time after ``date``, or None if none within ``search_days``."""
+        if observer_key(observer) != self._observer:
+            self._observer = observer_key(observer)
+            self._events.clear()
+
+        entry = self._events.get(key)
+        if entry is not None:
+            event, end = entry
+            # Encore valable si l'événement n'est pas passé, ou s'il n'y en
+            # avait pas et que la fenêtre recherchée n'est pas dépassée
+            if (event.ut > date.ut) if event is not None else (end.ut > date.ut):
+                return event
+
+        event = search(date)
+        self._events[key] = (event, date.AddDays(self.search_days))
+        return event
+
+    def rise_set(self, body, observer, direction, date, limit_days=1.0):
+        """Same result as ``astronomy.SearchRiseSet(body, observer, direction, date, limit_days)``."""
+        def search(start):
+            return astronomy.SearchRiseSet(body, observer, direction, start, self.search_days)
+
+        event = self._next((body, direction), observer, date, search)
+        if event is None or event.ut - date.ut > limit_days:
+            return None
+        return event
+
+    def rise(self, body, observer, date, limit_days=1.0):
+        return self.rise_set(body, observer, astronomy.Direction.Rise, date, limit_days)
+
+    def set(self, body, observer, date, limit_days=1.0):
+        return self.rise_set(body, observer, astronomy.Direction.Set, date, limit_days)
+
+    def transit(self, body, observer, date):
+        """Next upper culmination (hour angle 0) of ``body``."""
+        def search(start):
+            return astronomy.SearchHourAngle(body, observer, 0.0, start).time
+
+        return self._next((body, 'transit'), observer, date, search)
+
+    def horizon_crossing(self, body, observer, date):
+        """
+        Next time the refracted altitude of the center of ``body`` crosses 0.
+
+        Returns (time, state) where state is "ON" if the body rises at that
+        time and "OFF" if it sets, or (None, state) with the current state if
+        the body does not cross the horizon within ``search_days``.
+        """
+        crossings = []
+        for direction, state in ((astronomy.Direction.Rise, "ON"), (astronomy.Direction.Set, "OFF")):
+            def search(start, direction=direction):
+                return astronomy.SearchAltitude(body, observer, direction, start,
+                                                self.search_days, HORIZON_ALTITUDE)
+
+            event = self._next((body, 'horizon', direction), observer, date, search)
+            if event is not None:
+                crossings.append((event.ut, event, state))
+        if crossings:
+            _, event, state = min(crossings, key=lambda crossing: crossing[0])
+            return event, state
+
+        # Circumpolaire ou jamais levé : l'état ne change pas
+        equatorial = astronomy.Equator(body, date, observer, True, True)
+        horizon = astronomy.Horizon(date, observer, equatorial.ra, equatorial.dec, astronomy.Refraction.Airless)
+        return None, "ON" if horizon.altitude > HORIZON_ALTITUDE else "OFF"
+
+    def is_up(self, body, observer, date):
+        """Returns "ON" if ``body`` is above the horizon at ``date``, "OFF" otherwise."""
+        event, state = self.horizon_crossing(body, observer, date)
+        if event is None:
+            return state
+        return "OFF" if state == "ON" else "ON"
@@ -0,0 +1,41 @@
+"""
+Settings shared by the astro modules.
+
+Paths are relative to the working directory, like the ephemeris files
+loaded with ``load('de421.bsp')``; the cache folder can be moved with the
+``ASTRO_CACHE_DIR`` environment variable and the folder of the dashboard
+images with ``ASTRO_IMAGE_DIR``. ``ASTRO_EPHEMERIS_EXCERPT=0`` makes every
+computation use the full ephemeris instead of its excerpt around the
+current year (see ``astro.excerpt``), and ``ASTRO_POSITION_FITS=0`` computes
+every apparent position directly instead of from the per-day fits (see
+``astro.position_fit``). ``ASTRO_BACKENDS`` picks the library of each
+quantity of ``astro.backends``. The Earth orientation parameters are read
+from EARTH_ORIENTATION (see ``astro.earth_orientation``).
+"""
+import os
+
+# Observateur : Cherbourg
+LATITUDE = 49.6386
+LONGITUDE = -1.6163
+ELEVATION = 0.0
+TIMEZONE = 'Europe/Paris'
+
+# Éphémérides et noyaux lunaires, chargés depuis le dossier de travail
+EPHEMERIS = 'de421.bsp'
+MOON_TEXT_KERNELS = ('moon_080317.tf', 'pck00008.tpc')
+MOON_BINARY_KERNEL = 'moon_pa_de421_1900-2050.bpc'
+# Paramètres d'orientation de la Terre de l'IERS, mis à jour par « python -m astro iers »
+EARTH_ORIENTATION = 'finals2000A.all'
+EPHEMERIS_EXCERPT = os.environ.get('ASTRO_EPHEMERIS_EXCERPT', '1') != '0'
+POSITION_FITS = os.environ.get('ASTRO_POSITION_FITS', '1') != '0'
+# Bibliothèque par calcul, ex. « position=astronomy-engine,rise_set=skyfield »
+BACKENDS = os.environ.get('ASTRO_BACKENDS', '')
+
+CACHE_DIR = os.environ.get('ASTRO_CACHE_DIR', 'cache')
+IMAGE_DIR = os.environ.get('ASTRO_IMAGE_DIR', '/data/astronomy/images')
+
+
+def cache_path(filename):
+    """Returns the path of filename inside the cache folder, creating the folder if needed."""
+    os.makedirs(CACHE_DIR, exist_ok=True)
+    return os.path.join(CACHE_DIR, filename)
@@ -0,0 +1,101 @@
+"""
+Observation snapshot: the state of the sky seen by one observer at one instant.
+
+The observer's barycentric position is computed once, and the astrometric
+and apparent position of each body is computed the first time it is asked
+for, then reused by every derived quantity (alt/az, RA/Dec, distance,
+elongation, phase angle, illumination). Given a ``PositionCache``, alt/az,
+RA/Dec and distance come from its per-day fits instead.
+"""
+import numpy as np
+
+
+class Snapshot:
+    """
+    Parameters
+    ----------
+    eph : Skyfield ephemeris, e.g. load('de421.bsp')
+    observer : Skyfield vector sum (earth + topos)
+    t : Skyfield time
+    positions : PositionCache of the same ephemeris and observer, or None
+    """
+
+    def __init__(self, eph, observer, t, positions=None):
+        self.eph = eph
+        self.observer = observer
+        self.t = t
+        self.positions = positions
+        self.observer_at = observer.at(t)  # état barycentrique de l'observateur
+        self._astrometric = {}
+        self._apparent = {}
+        self._altaz = {}
+        self._radec = {}
+
+    def matches(self, eph, observer, t, positions=None):
+        """Returns True if the snapshot was built for these arguments."""
+        return (self.eph is eph and self.observer is observer and self.positions is positions
+                and np.shape(self.t.tt) == np.shape(t.tt)
+                and np.all(self.t.tt == t.tt))
+
+    def astrometric(self, name):
+        """Astrometric position of the body (light-time corrected)."""
+        if name not in self._astrometric:
+            self._astrometric[name] = self.observer_at.observe(self.eph[name])
+        return self._astrometric[name]
+
+    def apparent(self, name):
+        """Apparent position of the body (aberration and deflection applied)."""
+        if name not in self._apparent:
+            self._apparent[name] = self.astrometric(name).apparent()
+        return self._apparent[name]
+
+    def altaz(self, name):
+        """Returns alt, az, distance of the body."""
+        if name not in self._altaz:
+            if self.positions is not None:
+                self._altaz[name] = self.positions.altaz(name, self.t)
+            else:
+                self._altaz[name] = self.apparent(name).altaz()
+        return self._altaz[name]
+
+    def radec(self, name):
+        """Returns ra, dec, distance of the body."""
+        if name not in self._radec:
+            if self.positions is not None:
+                self._radec[name] = self.positions.radec(name, self.t)
+            else:
+                self._radec[name] = self.apparent(name).radec()
+        return self._radec[name]
+
+    def distance(self, name):
+        """Distance from the observer to the body."""
+        return self.radec(name)[2]
+
+    def elongation(self, name):
+        """Angular separation between the body and the Sun, in degrees."""
+        return self.apparent(name).separation_from(self.apparent('sun')).degrees
+
+    def phase_angle(self, name):
+        """Angle Sun - body - observer, in degrees."""
+        body = self.astrometric(name).position.au
+        to_observer = -body
+        to_sun = self.astrometric('sun').position.au - body
+        cos_angle = (np.sum(to_observer * to_sun, axis=0)
+                     / np.linalg.norm(to_observer, axis=0)
+                     / np.linalg.norm(to_sun, axis=0))
+        return np.degrees(np.arccos(np.clip(cos_angle, -1.0, 1.0)))
+
+    def illumination(self, name):
+        """Illuminated fraction of the disc (0-1)."""
+        return (1 + np.cos(np.radians(self.phase_angle(name)))) / 2
+
+
+_last_snapshot = None
+
+
+def snapshot_at(eph, observer, t, positions=None):
+    """Returns the snapshot for t, reusing the last one built for the same instant."""
+    global _last_snapshot
+    if _last_snapshot is None or not _last_snapshot.matches(eph, observer, t, positions):
+        _last_snapshot = Snapshot(eph, observer, t, positions)
+    return _last_snapshot
@@ -0,0 +1,217 @@
+"""
+Sun: rise and set, position, daily extrema, twilights and constellation.
+
+Run ``python -m astro sun`` (or ``scripts/sun_calculations.py``) from the
+folder holding the ephemeris files to print the report.
+"""
+from skyfield import almanac
+from datetime import timedelta
+
+from astro import analytic, resources
+from astro.constellations import current_constellation
+from astro.culmination import altitude_extrema
+from astro.snapshot import snapshot_at
+
+def nearest_minute(dt):
+    return (dt + timedelta(seconds=30)).replace(second=0, microsecond=0)
+
+def get_day_bounds(t):
+    # Début du jour (UTC) de t, du lendemain et du surlendemain
+    ts = resources.timescale()
+    dt = t.utc_datetime()
+    t0 = ts.utc(dt.year, dt.month, dt.day)
+    t1 = ts.utc((dt + timedelta(days=1)).year, (dt + timedelta(days=1)).month, (dt + timedelta(days=1)).day)
+    t2 = ts.utc((dt + timedelta(days=2)).year, (dt + timedelta(days=2)).month, (dt + timedelta(days=2)).day)
+    return t0, t1, t2
+
+def get_twilight_events(t):
+    # Crépuscules du jour de t, calculés une fois par jour
+    eph, topos = resources.ephemeris(), resources.location()
+    t0, t1, _ = get_day_bounds(t)
+    return resources.event_cache().find_discrete('dark_twilight_day', 'sun', topos, eph, t0, t1,
+                                                 lambda: almanac.dark_twilight_day(eph, topos))
+
+def get_next_sunrise_sunset(t):
+
+    # Calculer les heures de lever et de coucher du soleil
+    eph, topos = resources.ephemeris(), resources.location()
+    dt = t.utc_datetime()
+    t0, _, t2 = get_day_bounds(t)
+    times_sun, events_sun = resources.event_cache().find_discrete('sunrise_sunset', 'sun', topos, eph, t0, t2,
+                                                                  lambda: almanac.sunrise_sunset(eph, topos))
+
+    next_sunrise = None
+    next_sunset = None
+
+    for t, e in zip(times_sun, events_sun):
+        if t.utc_datetime() > dt:
+            rounded_time = nearest_minute(t.utc_datetime())
+            rounded_time_paris = rounded_time.astimezone(resources.timezone())
+            if e and next_sunrise is None:
+                next_sunrise = rounded_time_paris.strftime('%Y-%m-%d %H:%M')
+            elif not e and next_sunset is None:
+                next_sunset = rounded_time_paris.strftime('%Y-%m-%d %H:%M')
+            if next_sunrise and next_sunset:
+                break
+
+    return next_sunrise, next_sunset
+
+def get_snapshot(t):
+    # Positions calculées une seule fois pour l'instant t
+    return snapshot_at(resources.ephemeris(), resources.observer(), t, resources.position_cache())
+
+def get_sun_altaz(t, backend='skyfield'):
+    # backend='analytic' : séries analytiques, rapides mais approchées (voir astro/analytic.py)
+    if backend == 'analytic':
+        return analytic.sun_altaz(t)
+    alt, az, d = get_snapshot(t).altaz('sun')
+    return alt, az, d
+
+def get_sun_ra_dec(t, backend='skyfield'):
+    if backend == 'analytic':
+        return analytic.sun_ra_dec(t)
+    ra, dec, d = get_snapshot(t).radec('sun')
+    return ra, dec, d
+
+def get_sun_altitude_extrema(t):
+    # Altitudes la plus basse et la plus haute sur les 24 heures qui suivent t,
+    # d'une seule recherche
+    return altitude_extrema(resources.observer(), resources.ephemeris()['sun'], t,
+                            positions=resources.position_cache())
+
+def get_min_sun_altitude(t):
+    return get_sun_altitude_extrema(t)[0]
+
+def get_max_sun_altitude(t):
+    return get_sun_altitude_extrema(t)[1]
+
+def get_twilight_times(t):
+
+    twilight_times = {
+        'astronomical': (None, None),
+        'nautical': (None, None),
+        'civil': (None, None),
+        'day': (None, None),
+        'night': (None, None)
+    }
+
+    times_twilight, events_twilight = get_twilight_events(t)
+    for t, e in zip(times_twilight, events_twilight):
+        rounded_time = nearest_minute(t.utc_datetime()).astimezone(resources.timezone()).strftime('%Y-%m-%d %H:%M')
+        if e == 0:
+            twilight_times['night'] = (rounded_time, twilight_times['night'][1])
+        elif e == 1:
+            twilight_times['astronomical'] = (rounded_time, twilight_times['astronomical'][1])
+        elif e == 2:
+            twilight_times['nautical'] = (rounded_time, twilight_times['nautical'][1])
+        elif e == 3:
+            twilight_times['civil'] = (rounded_time, twilight_times['civil'][1])
+        elif e == 4:
+            twilight_times['day'] = (rounded_time, twilight_times['day'][1])
+        elif e == 5:
+            twilight_times['civil'] = (twilight_times['civil'][0], rounded_time)
+        elif e == 6:
+            twilight_times['nautical'] = (twilight_times['nautical'][0], rounded_time)
+        elif e == 7:
+            twilight_times['astronomical'] = (twilight_times['astronomical'][0], rounded_time)
+        elif e == 8:
+            twilight_times['night'] = (twilight_times['night'][0], rounded_time)
+
+    return twilight_times
+
+def dawn_time(t, twilight_type, moment):
+    index_map = {
+        'astronomical_dusk': {'start': 0, 'end': 1},
+        'nautical_dusk': {'start': 1, 'end': 2},
+        'civil_dusk': {'start': 2, 'end': 3},
+        'civil_dawn': {'start': 4, 'end': 5},
+        'nautical_dawn': {'start': 5, 'end': 6},
+        'astronomical_dawn': {'start': 6, 'end': 7}
+    }
+    index = index_map[twilight_type][moment]
+    times_twilight, _ = get_twilight_events(t)
+    dawn_time = nearest_minute(times_twilight.utc_datetime()[index]).astimezone(resources.timezone()).strftime('%Y-%m-%d %H:%M')
+    return dawn_time
+
+def is_sun_above_altitude(t, altitude):
+    alt, _, _ = get_sun_altaz(t)
+    return alt.degrees > altitude
+
+def twilight(t, altitude):
+    return is_sun_above_altitude(t, altitude)
+
+def get_sun_constellation(t):
+    # Constellation lue parmi les franchissements de frontières de l'année
+    return str(current_constellation('sun', t))
+
+def get_sun_report(t):
+    """Returns the values printed by this script as a JSON-serializable dict."""
+    alt, az, d = get_sun_altaz(t)
+    ra, dec, _ = get_sun_ra_dec(t)
+    next_sunrise, next_sunset = get_next_sunrise_sunset(t)
+    (min_time, min_azimuth, min_altitude), (max_time, max_azimuth, max_altitude) = get_sun_altitude_extrema(t)
+    return {
+        "next_sunrise": next_sunrise,
+        "next_sunset": next_sunset,
+        "altitude_degrees": alt.degrees,
+        "azimuth_degrees": az.degrees,
+        "distance_au": d.au,
+        "distance_km": d.km,
+        "right_ascension": ra.hours,
+        "declination": dec.degrees,
+        "min_altitude_time": min_time.astimezone(resources.timezone()).strftime('%Y-%m-%d %H:%M'),
+        "min_altitude_degrees": min_altitude,
+        "min_azimuth_degrees": min_azimuth,
+        "max_altitude_time": max_time.astimezone(resources.timezone()).strftime('%Y-%m-%d %H:%M'),
+        "max_altitude_degrees": max_altitude,
+        "max_azimuth_degrees": max_azimuth,
+        "twilights": get_twilight_times(t),
+        "constellation": get_sun_constellation(t),
+    }
+
+# Exemple d'utilisation
+
+def main(argv=None):
+    t = resources.timescale().now()
+    next_sunrise, next_sunset = get_next_sunrise_sunset(t)
+
+    (min_time, min_azimuth, min_altitude), (max_time, max_azimuth, max_altitude) = get_sun_altitude_extrema(t)
+    min_time_paris = min_time.astimezone(resources.timezone()).strftime('%Y-%m-%d %H:%M')
+    max_time_paris = max_time.astimezone(resources.timezone()).strftime('%Y-%m-%d %H:%M')
+
+
+    print(f"Next Sunrise: {next_sunrise}")
+    print(f"Next Sunset: {next_sunset}")
+    print(f"Current Sun Altitude: {get_sun_altaz(t)[0].degrees:.2f} degrees")
+    print(f"Current Sun Azimuth: {get_sun_altaz(t)[1].degrees:.2f} degrees")
+    print(f"Current Sun Distance: {get_sun_altaz(t)[2].au:.7f} AU / {get_sun_altaz(t)[2].km:.2f} km")
+    print(f"Current Sun RA: {get_sun_ra_dec(t)[0]}")
+    print(f"Current Sun Declination: {get_sun_ra_dec(t)[1].dstr(places=1, warn=True, format=u'{0}{1}° {2:02}′ {3:02}.{4:0{5}}″')}")
+    print(f"Minimum Sun Altitude Time: {min_time_paris}")
+    print(f"Minimum Sun Altitude: {min_altitude:.2f} degrees")
+    print(f"Minimum Sun Azimuth: {min_azimuth:.2f} degrees")
+    print(f"Maximum Sun Altitude Time: {max_time_paris}")
+    print(f"Maximum Sun Altitude: {max_altitude:.2f} degrees")
+    print(f"Maximum Sun Azimuth: {max_azimuth:.2f} degrees")
+    print(f"Is the Sun above -6 degrees? {twilight(t, -6)}")
+    print(f"Is the Sun above -12 degrees? {twilight(t, -12)}")
+    print(f"Is the Sun above -18 degrees? {twilight(t, -18)}")
+    print(f"Is the Sun above -4 degrees? {twilight(t, -4)}")
+    print(f"Is the Sun above 6 degrees? {twilight(t, 6)}")
+    print(f"Astronomical Dusk Start: {dawn_time(t, 'astronomical_dusk', 'start')}")
+    print(f"Astronomical Dusk End: {dawn_time(t, 'astronomical_dusk', 'end')}")
+    print(f"Nautical Dusk Start: {dawn_time(t, 'nautical_dusk', 'start')}")
+    print(f"Nautical Dusk End: {dawn_time(t, 'nautical_dusk', 'end')}")
+    print(f"Civil Dusk Start: {dawn_time(t, 'civil_dusk', 'start')}")
+    print(f"Civil Dusk End: {dawn_time(t, 'civil_dusk', 'end')}")
+    print(f"Civil Dawn Start: {dawn_time(t, 'civil_dawn', 'start')}")
+    print(f"Civil Dawn End: {dawn_time(t, 'civil_dawn', 'end')}")
+    print(f"Nautical Dawn Start: {dawn_time(t, 'nautical_dawn', 'start')}")
+    print(f"Nautical Dawn End: {dawn_time(t, 'nautical_dawn', 'end')}")
+    print(f"Astronomical Dawn Start: {dawn_time(t, 'astronomical_dawn', 'start')}")
+    print(f"Astronomical Dawn End: {dawn_time(t, 'astronomical_dawn', 'end')}")
+    print(f"Sun Constellation: {get_sun_constellation(t)}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,17 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Service astronomique résident.
+
+Charge une seule fois les éphémérides (de421.bsp) et les noyaux lunaires,
+puis répond aux requêtes de Node-RED sur une socket locale au lieu de lancer
+un nouveau processus Python à chaque minute. Voir astro/daemon.py pour le
+protocole.
+
+A lancer depuis le dossier contenant les fichiers d'éphémérides :
+    python scripts/astronomy_daemon.py --port 8765 [--mqtt localhost]
+"""
+from astro.daemon import main
+
+if __name__ == '__main__':
+    main()
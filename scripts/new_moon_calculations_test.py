@@ -1,11 +1,12 @@
 from astroplan import Observer, FixedTarget
-from astroplan import download_IERS_A
 from astropy.time import Time
 from astropy.coordinates import EarthLocation, get_body
 import astropy.units as u
 
-# Télécharger les données IERS nécessaires
-download_IERS_A()
+from astro.earth_orientation import configure_astropy
+
+# Données IERS locales (python -m astro iers), sans téléchargement
+configure_astropy()
 
 # Définir l'emplacement de Cherbourg, France
 cherbourg = EarthLocation(lat=49.6386*u.deg, lon=-1.6164*u.deg, height=0*u.m)
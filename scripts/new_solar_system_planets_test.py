@@ -7,7 +7,12 @@ from astropy.time import Time
 import astropy.units as u
 from datetime import datetime
 import pytz
-from astroquery.jplhorizons import Horizons
+from astro import resources
+from astro.earth_orientation import configure_astropy
+from astro.magnitudes import EQUATORIAL_RADIUS_KM, photometry
+
+# Données IERS locales (python -m astro iers), sans téléchargement
+configure_astropy()
 
 def get_location(lat, lon, height=0):
     """Returns an EarthLocation object for the given latitude, longitude, and height."""
@@ -40,11 +45,6 @@ def get_geocentric_coordinates(planet, time):
     geocentric_coords = body_position - earth_position
     return geocentric_coords.x, geocentric_coords.y, geocentric_coords.z
 
-def get_planet_ephemerides(id, time):
-    """Returns the ephemerides of the given planet at the specified time."""
-    obj = Horizons(id=id, location='500', epochs=time.jd)
-    return obj.ephemerides()
-
 def get_planet_rise_set_transit_times(body, location, time):
     """Returns the rise, set, and transit times of the given planet at the specified location and time."""
     delta_t = 1 * u.hour
@@ -56,24 +56,9 @@ def get_planet_rise_set_transit_times(body, location, time):
     return body_rise, body_set, body_transit
 
 def get_perihelion_aphelion_dates(planet, time):
-    """Returns the perihelion and aphelion dates of the given planet."""
-    start_date = Time(datetime.now(tz=pytz.timezone("Europe/Paris")))
-    current_time_difference = (Time('2027-01-01') - Time('2024-08-01')).jd
-    end_date = start_date + current_time_difference * u.day
-    time_range = start_date + np.linspace(0, (end_date - start_date).jd, 1000) * u.day
-
-    with solar_system_ephemeris.set('builtin'):
-        body_positions = get_body_barycentric(planet, time_range)
-        sun_positions = get_body_barycentric('sun', time_range)
-
-    distances = np.linalg.norm(body_positions.xyz - sun_positions.xyz, axis=0)
-    perihelion_index = np.argmin(distances)
-    aphelion_index = np.argmax(distances)
-
-    perihelion_date = time_range[perihelion_index]
-    aphelion_date = time_range[aphelion_index]
-
-    return perihelion_date, aphelion_date
+    """Returns the dates of the next perihelion and aphelion of the given planet after the specified time."""
+    perihelion_tt, aphelion_tt = resources.apsis_catalog().next_after(planet, time.tt.jd)
+    return Time(perihelion_tt, format='jd', scale='tt'), Time(aphelion_tt, format='jd', scale='tt')
 
 def calculate_orbital_elements(body, time):
     """Calculates and returns the orbital elements of the given planet."""
@@ -128,32 +113,6 @@ def convert_to_galactic_coordinates(ra, dec):
     galactic_coord = coord.galactic
     return galactic_coord.l, galactic_coord.b
 
-def calculate_angular_diameter(planet, distance_au):
-    """Calculates and returns the angular diameter of the given planet at the specified distance."""
-    planet_diameter_km = {
-        'mercury': 4880,
-        'venus': 12104,
-        'mars': 6792,
-        'jupiter': 142984,
-        'saturn': 120536,
-        'uranus': 51118,
-        'neptune': 49528
-    }
-    
-    # Vérifiez si la planète est dans le dictionnaire
-    if planet not in planet_diameter_km:
-        raise ValueError(f"Diameter for planet '{planet}' is not defined.")
-    
-    diameter_km = planet_diameter_km[planet]
-    distance_km = distance_au * 1.496e+8  # Conversion de la distance de UA en kilomètres
-    
-    if distance_km == 0:
-        raise ValueError("Distance cannot be zero.")
-    
-    angular_diameter_radians = diameter_km / distance_km
-    angular_diameter_arcseconds = angular_diameter_radians * 206265
-    return angular_diameter_arcseconds, planet_diameter_km
-
 # Define the location of Cherbourg
 cherbourg = get_location(49.65, -1.62)
 
@@ -182,8 +141,12 @@ parallax_values = {
     'neptune': 0.0003
 }
 
+# Magnitude (V), phase angle (alpha) and angular diameter of all the planets at once, seen from the geocenter
+planet_photometry = photometry(list(planets), resources.timescale().from_astropy(local_time_astropy))
+planet_diameter_km = {name: 2 * radius for name, radius in EQUATORIAL_RADIUS_KM.items()}
+
 # Get the information for each planet
-for planet, id in planets.items():
+for index, (planet, id) in enumerate(planets.items()):
     with solar_system_ephemeris.set('builtin'):
         body = get_body(planet, local_time_astropy, location=cherbourg)
         sun = get_body('sun', local_time_astropy, location=cherbourg)
@@ -194,9 +157,8 @@ for planet, id in planets.items():
     dec_dms = dec.to_string(unit=u.deg, sep='dms', precision=0)
     distance_au = body.distance.to(u.au)
     elongation = body.separation(sun)
-    eph = get_planet_ephemerides(id, local_time_astropy)
-    brightness = eph['V'][0]
-    phase_angle = eph['alpha'][0]
+    brightness = planet_photometry['magnitude'][index]
+    phase_angle = planet_photometry['phase_angle'][index]
     constellation = get_constellation(body)
     body_rise, body_set, body_transit = get_planet_rise_set_transit_times(body, cherbourg, local_time_astropy)
     body_rise_local = body_rise.to_datetime(timezone=pytz.timezone("Europe/Paris"))
@@ -226,8 +188,9 @@ for planet, id in planets.items():
     galactic_l, galactic_b = convert_to_galactic_coordinates(ra, dec)
 
 
-    # Calculate angular diameter
-    angular_diameter_arcseconds, planet_diameter_km = calculate_angular_diameter(planet, distance_au)
+    # Angular diameter
+    angular_diameter_arcseconds = planet_photometry['angular_diameter'][index]
+    surface_brightness = planet_photometry['surface_brightness'][index]
 
     # Convert to value and print
     angular_diameter_value = angular_diameter_arcseconds
@@ -274,5 +237,6 @@ for planet, id in planets.items():
     print(f"- Light travel time (hours): {light_travel_time_hours:.2f}")
     print(f"- Galactic coordinates: l={galactic_l:.2f}, b={galactic_b:.2f}")
     print(f"- Angular diameter: {angular_diameter_arcseconds:.2f} arcseconds")
+    print(f"- Surface brightness: {surface_brightness:.2f} mag/arcsec²")
     print(f"- Planet diameter (km): {planet_diameter_km.get(planet, 'Not found')}")
     print("---")
\ No newline at end of file
@@ -2,6 +2,9 @@ import skyfield.api as sf
 import time
 import json
 
+from astro import resources
+from astro.magnitudes import photometry
+
 # Load ephemeris data for accurate calculations
 eph = sf.load('de421.spk')
 ts = sf.Time(scale='utc')
@@ -17,7 +20,9 @@ planets = [
 
 def publish_planet_data():
     planet_data = {}
-    for planet_name in planets:
+    # Magnitudes de toutes les planètes en un seul calcul (astro/magnitudes.py)
+    magnitudes = photometry(planets, resources.timescale().now())['magnitude']
+    for index, planet_name in enumerate(planets):
         try:
             # Get planet object from ephemeris
             sky_planet = eph.planets(planet_name)
@@ -35,7 +40,6 @@ def publish_planet_data():
 
             # Calculate illumination (custom calculation using phase angle)
             phase_angle = sky_planet.topos(observer.latitude, observer.longitude, elevation=observer.height).separation_from(sun).angle
-            # Use online resources or libraries for phase curve fitting to estimate magnitude
 
             # Constellation lookup (potentially using online services)
             constellation = "N/A"  # Placeholder, replace with constellation lookup
@@ -62,7 +66,7 @@ def publish_planet_data():
                 "declination": equatorial.dec.degrees,
                 "distance_au": distance.au,
                 "elongation_degrees": elongation_deg,
-                "magnitude_apparente": "N/A",  # Replace with calculated magnitude
+                "magnitude_apparente": float(magnitudes[index]),
                 "phase_angle": phase_angle.degrees,
                 "constellation": constellation,
                 "altitude_degrees": alt.degrees,
@@ -0,0 +1,37 @@
+import os
+import sys
+
+import pytest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(ROOT, 'scripts'))
+
+
+@pytest.fixture(scope='session', autouse=True)
+def working_directory(tmp_path_factory):
+    """Runs from the root of the repository, where the kernels are, with a cache folder of its own."""
+    from astro import settings
+
+    cwd, cache_dir = os.getcwd(), settings.CACHE_DIR
+    os.chdir(ROOT)
+    settings.CACHE_DIR = str(tmp_path_factory.mktemp('cache'))
+    yield
+    settings.CACHE_DIR = cache_dir
+    os.chdir(cwd)
+
+
+@pytest.fixture(scope='session')
+def eph():
+    """Ephemeris of the settings, the test is skipped without de421.bsp."""
+    from astro import resources, settings
+
+    if not os.path.exists(os.path.join(ROOT, settings.EPHEMERIS)):
+        pytest.skip(f'{settings.EPHEMERIS} missing')
+    return resources.ephemeris()
+
+
+@pytest.fixture(scope='session')
+def ts():
+    from astro import resources
+
+    return resources.timescale()
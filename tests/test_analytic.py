@@ -0,0 +1,44 @@
+import datetime as dt
+
+import numpy as np
+import pytest
+
+from astro import analytic, resources
+
+
+def separation_arcsec(lon1, lat1, lon2, lat2):
+    """Angle between two directions given in degrees."""
+    lon1, lat1, lon2, lat2 = np.radians([lon1, lat1, lon2, lat2])
+    cos_angle = np.sin(lat1) * np.sin(lat2) + np.cos(lat1) * np.cos(lat2) * np.cos(lon1 - lon2)
+    return np.degrees(np.arccos(np.clip(cos_angle, -1.0, 1.0))) * 3600
+
+
+@pytest.fixture(scope='module')
+def times(ts):
+    # Dates tirées dans l'étendue de l'extrait de l'éphéméride
+    tt = ts.utc(dt.date.today().year, 1, 1).tt + np.random.default_rng(1).uniform(0, 3 * 365, 500)
+    return ts.tt_jd(tt)
+
+
+@pytest.mark.parametrize('body, altaz, ra_dec, tolerance_arcsec', [
+    ('sun', analytic.sun_altaz, analytic.sun_ra_dec, 35.0),
+    ('moon', analytic.moon_altaz, analytic.moon_ra_dec, 66.0),
+])
+def test_against_skyfield(eph, times, body, altaz, ra_dec, tolerance_arcsec):
+    apparent = resources.observer().at(times).observe(eph[body]).apparent()
+    alt, az, distance = apparent.altaz()
+    ra, dec, _ = apparent.radec()
+
+    fast_alt, fast_az, fast_distance = altaz(times)
+    assert separation_arcsec(fast_az.degrees, fast_alt.degrees, az.degrees, alt.degrees).max() < tolerance_arcsec
+    fast_ra, fast_dec, _ = ra_dec(times)
+    assert separation_arcsec(fast_ra.hours * 15, fast_dec.degrees, ra.hours * 15, dec.degrees).max() \
+        < tolerance_arcsec
+    assert np.abs(fast_distance.au / distance.au - 1).max() < 2e-4
+
+
+def test_scalar_time(eph, ts):
+    t = ts.utc(dt.date.today().year, 6, 21, 12)
+    alt, az, distance = analytic.sun_altaz(t)
+    assert np.shape(alt.degrees) == ()
+    assert 0.98 < distance.au < 1.02
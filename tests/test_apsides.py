@@ -0,0 +1,67 @@
+import astronomy
+import numpy as np
+import pytest
+
+from astro import apsides
+
+SECOND = 1 / 86400
+J2000 = 2451545.0
+START = astronomy.Time.Make(2026, 1, 1, 0, 0, 0)
+
+
+def engine_apsides(name, tt0, tt1):
+    """tt, kinds and distances of the apsides found by astronomy-engine."""
+    body = getattr(astronomy.Body, name.capitalize())
+    apsis = astronomy.SearchPlanetApsis(body, astronomy.Time(tt0 - J2000))
+    found = []
+    while apsis.time.tt + J2000 < tt1:
+        found.append((apsis.time.tt + J2000, apsis.kind.value, apsis.dist_au))
+        apsis = astronomy.NextPlanetApsis(body, apsis)
+    return np.array(found).T
+
+
+@pytest.mark.parametrize('name, orbits', [('mercury', 3), ('venus', 3), ('earth', 3), ('mars', 3),
+                                          ('jupiter', 1.1), ('saturn', 1.1)])
+def test_against_astronomy_engine(name, orbits):
+    tt0 = START.tt + J2000
+    tt1 = tt0 + orbits * apsides.PERIOD_DAYS[name]
+    tt, kinds, distances = apsides.find_apsides(name, tt0, tt1)
+    expected_tt, expected_kinds, expected_distances = engine_apsides(name, tt0, tt1)
+    assert list(kinds) == list(expected_kinds.astype(int))
+    assert np.abs(tt - expected_tt).max() < 5 * SECOND
+    assert np.allclose(distances, expected_distances, rtol=0, atol=1e-9)
+
+
+def test_one_perihelion_per_orbit_of_neptune():
+    # Les ondulations dues au mouvement du Soleil ne donnent pas d'apsides en trop
+    tt0 = START.tt + J2000
+    tt, kinds, _ = apsides.find_apsides('neptune', tt0 - 2 * apsides.PERIOD_DAYS['neptune'], tt0)
+    assert np.all(np.diff(kinds) != 0)
+    assert np.diff(tt).min() > 0.4 * apsides.PERIOD_DAYS['neptune']
+
+
+def test_catalog(tmp_path, monkeypatch):
+    catalog = apsides.ApsisCatalog(str(tmp_path / 'apsides.npz'))
+    tt0 = START.tt + J2000
+    perihelion, aphelion = catalog.next_after('earth', tt0)
+    expected_tt, expected_kinds, _ = engine_apsides('earth', tt0, tt0 + 366)
+    assert perihelion == pytest.approx(expected_tt[expected_kinds == apsides.PERIHELION][0], abs=5 * SECOND)
+    assert aphelion == pytest.approx(expected_tt[expected_kinds == apsides.APHELION][0], abs=5 * SECOND)
+
+    # Dans l'étendue déjà couverte, pas de nouvelle recherche, même depuis un autre processus
+    def find(*args):
+        raise AssertionError('apsides searched again')
+    monkeypatch.setattr(apsides, 'find_apsides', find)
+    reloaded = apsides.ApsisCatalog(catalog.path)
+    assert reloaded.next_after('earth', tt0) == (perihelion, aphelion)
+
+
+def test_catalog_extension(tmp_path):
+    catalog = apsides.ApsisCatalog(str(tmp_path / 'apsides.npz'))
+    tt0 = START.tt + J2000
+    catalog.ensure('mars', tt0, tt0 + 100)
+    catalog.ensure('mars', tt0 - 2000, tt0 + 3000)
+    tt, kinds, _ = catalog.between('mars', tt0 - 2000, tt0 + 3000)
+    expected_tt, expected_kinds, _ = apsides.find_apsides('mars', tt0 - 2000, tt0 + 3000)
+    assert np.allclose(tt, expected_tt, rtol=0, atol=SECOND)
+    assert list(kinds) == list(expected_kinds)
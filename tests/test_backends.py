@@ -0,0 +1,66 @@
+import datetime as dt
+
+import pytest
+
+from astro import backends, resources, settings
+
+
+@pytest.fixture
+def configure(monkeypatch):
+    def configure(value):
+        monkeypatch.setattr(settings, 'BACKENDS', value)
+    return configure
+
+
+def test_configured(configure):
+    configure('')
+    assert backends._configured() == dict.fromkeys(backends.QUANTITIES, 'skyfield')
+    configure('position=astronomy-engine,lunar_eclipse=astronomy-engine')
+    assert backends._configured() == {'position': 'astronomy-engine', 'rise_set': 'skyfield',
+                                      'phase': 'skyfield', 'lunar_eclipse': 'astronomy-engine'}
+
+
+@pytest.mark.parametrize('value', ['position=nope', 'color=skyfield', 'lunar_eclipse=astropy'])
+def test_configured_rejects(configure, value):
+    configure(value)
+    with pytest.raises(ValueError, match='ASTRO_BACKENDS'):
+        backends._configured()
+
+
+def test_implements():
+    assert all(backends.SkyfieldBackend.implements(quantity) for quantity in backends.QUANTITIES)
+    assert all(backends.AstronomyEngineBackend.implements(quantity) for quantity in backends.QUANTITIES)
+    assert not backends.AstropyBackend.implements('lunar_eclipse')
+    assert backends.AstropyBackend.implements('position')
+    with pytest.raises(ValueError):
+        backends.backend_for('lunar_eclipse', 'astropy')
+
+
+@pytest.mark.parametrize('body', backends.BODIES)
+def test_astronomy_engine_agrees_with_skyfield(eph, ts, body):
+    t = ts.utc(dt.date.today().year, 3, 1, 12)
+    skyfield, engine = backends.get('skyfield'), backends.get('astronomy-engine')
+    position, reference = engine.position(body, t), skyfield.position(body, t)
+    assert backends._angle(position.right_ascension, position.declination,
+                           reference.right_ascension, reference.declination) < 20
+    assert backends._angle(position.azimuth_degrees / 15, position.altitude_degrees,
+                           reference.azimuth_degrees / 15, reference.altitude_degrees) < 20
+    assert position.distance_au == pytest.approx(reference.distance_au, rel=5e-4)
+    for a, b in zip(engine.rise_set(body, t), skyfield.rise_set(body, t)):
+        assert backends._seconds(a, b) < 5
+    if body != 'sun':
+        assert engine.phase(body, t)[0] == pytest.approx(skyfield.phase(body, t)[0], abs=0.05)
+
+
+def test_lunar_eclipse(eph, ts):
+    t = ts.utc(dt.date.today().year, 1, 1)
+    peak, kind = backends.lunar_eclipse(t)
+    reference_peak, reference_kind = backends.lunar_eclipse(t, backend='astronomy-engine')
+    assert kind == reference_kind
+    assert backends._seconds(peak, reference_peak) < 60
+
+
+def test_lunar_eclipse_past_ephemeris(eph, ts):
+    # Quelques jours avant la fin de DE421 : pas d'éclipse, sans erreur
+    end = resources.eclipse_catalog()._span()[1]
+    assert backends.get('skyfield').lunar_eclipse(ts.tt_jd(end - 3)) == (None, None)
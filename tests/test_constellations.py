@@ -0,0 +1,47 @@
+import datetime as dt
+
+import numpy as np
+import pytest
+
+from astro import constellations, resources
+
+MINUTE = 1 / 1440
+
+
+def direct(eph, body, t):
+    return resources.constellation_map()(resources.observer().at(t).observe(eph[body]).apparent())
+
+
+def test_constellation_of():
+    assert constellations.constellation_of(2.53, 89.26) == 'UMi'
+    assert list(constellations.constellation_of(np.array([5.6, 6.75]), np.array([-1.2, -16.7]))) \
+        == ['Ori', 'CMa']
+
+
+@pytest.mark.parametrize('body', ['sun', 'moon', 'mars'])
+def test_current_against_direct(eph, ts, body):
+    year = dt.date.today().year
+    tt, _, _ = constellations.constellation_crossings(body, year)
+    t0 = ts.utc(year, 1, 1).tt
+    times = t0 + np.random.default_rng(2).uniform(0, 365, 60)
+    # Loin des franchissements, la recherche est exacte à la minute près
+    times = times[np.min(np.abs(times[:, None] - tt[None, :]), axis=1, initial=np.inf) > MINUTE]
+    t = ts.tt_jd(times)
+    assert [constellations.current_constellation(body, t[i]) for i in range(len(t))] \
+        == list(direct(eph, body, t))
+
+
+def test_next_crossing(eph, ts):
+    t = ts.utc(dt.date.today().year, 3, 1)
+    time, entered = constellations.next_crossing('moon', t)
+    assert 0 < time.tt - t.tt < 5
+    before, after = direct(eph, 'moon', ts.tt_jd(time.tt + np.array([-MINUTE, MINUTE])))
+    assert before == constellations.current_constellation('moon', t) != after == entered
+
+
+def test_next_crossing_across_year(eph, ts):
+    year = dt.date.today().year
+    tt, _, _ = constellations.constellation_crossings('sun', year)
+    time, entered = constellations.next_crossing('sun', ts.tt_jd(tt[-1]))
+    assert time.utc_datetime().year == year + 1
+    assert entered == constellations.current_constellation('sun', ts.tt_jd(time.tt + MINUTE))
@@ -0,0 +1,43 @@
+import datetime as dt
+
+import numpy as np
+import pytest
+
+from astro import resources
+from astro.culmination import altitude_extrema
+from astro.position_fit import PositionCache
+
+
+def brute_force(observer, body, ts, start, sign):
+    """Time (TT) and altitude of the extremum, minute by minute then second by second."""
+    tt = start.tt + np.arange(24 * 60 + 1) / (24 * 60)
+    alt = observer.at(ts.tt_jd(tt)).observe(body).apparent().altaz()[0].degrees
+    best = tt[np.argmax(sign * alt)]
+    tt = np.clip(best + np.arange(-120, 121) / 86400, start.tt, start.tt + 1)
+    alt = observer.at(ts.tt_jd(tt)).observe(body).apparent().altaz()[0].degrees
+    return tt[np.argmax(sign * alt)], (sign * alt).max() * sign
+
+
+@pytest.mark.parametrize('body', ['sun', 'moon', 'mars'])
+def test_against_brute_force(eph, ts, body, tmp_path):
+    observer = resources.observer()
+    start = ts.utc(dt.date.today().year, 5, 10)
+    direct = altitude_extrema(observer, eph[body], start)
+    positions = PositionCache(eph, resources.location(), ts, 'test', folder=str(tmp_path))
+    fitted = altitude_extrema(observer, eph[body], start, positions=positions)
+    for k, sign in enumerate((-1, 1)):
+        tt, alt = brute_force(observer, eph[body], ts, start, sign)
+        for time, _, altitude in (direct[k], fitted[k]):
+            assert abs(ts.from_datetime(time).tt - tt) * 86400 < 5
+            assert altitude == pytest.approx(alt, abs=1e-4)
+        assert fitted[k][1] == pytest.approx(direct[k][1], abs=1e-4)
+
+
+def test_extremum_at_window_bound(eph, ts):
+    # Fenêtre d'une heure autour du lever : l'altitude ne fait que monter
+    observer = resources.observer()
+    start = ts.utc(dt.date.today().year, 5, 10, 4)
+    (t_min, _, alt_min), (t_max, _, alt_max) = altitude_extrema(observer, eph['sun'], start, days=1 / 24)
+    assert alt_min < alt_max
+    assert (t_min - start.utc_datetime()).total_seconds() == pytest.approx(0, abs=1e-3)
+    assert (t_max - t_min).total_seconds() == pytest.approx(3600, abs=1e-3)
@@ -0,0 +1,58 @@
+import datetime as dt
+
+import numpy as np
+import pytest
+from skyfield import eclipselib
+
+from astro.eclipses import EDGE_DAYS, EclipseCatalog
+
+SECOND = 1 / 86400
+
+
+@pytest.fixture
+def catalog(eph, tmp_path):
+    return EclipseCatalog(eph, path=str(tmp_path / 'lunar_eclipses.npz'))
+
+
+def test_against_eclipselib(eph, ts, catalog):
+    year = dt.date.today().year
+    t0, t1 = ts.utc(year, 1, 1), ts.utc(year + 2, 12, 1)
+    expected_t, expected_y, expected_details = eclipselib.lunar_eclipses(t0, t1, eph)
+    assert len(expected_t) > 0
+    # En deux requêtes : la seconde étend le catalogue
+    catalog.between(t0, ts.utc(year, 6, 1))
+    t, y, details = catalog.between(t0, t1)
+    assert np.allclose(t.tt, expected_t.tt, rtol=0, atol=5 * SECOND)
+    assert list(y) == list(expected_y)
+    for name, values in expected_details.items():
+        # Grandeurs et rayons des ombres, à la date trouvée à la seconde près
+        assert np.allclose(details[name], values, rtol=0, atol=1e-5)
+
+
+def test_reused_from_file(eph, ts, catalog, monkeypatch):
+    year = dt.date.today().year
+    t0, t1 = ts.utc(year, 1, 1), ts.utc(year + 1, 1, 1)
+    expected = catalog.between(t0, t1)[0].tt
+
+    def search(*args):
+        raise AssertionError('catalog searched again')
+    monkeypatch.setattr(EclipseCatalog, '_search', search)
+    reloaded = EclipseCatalog(eph, path=catalog.path)
+    assert np.array_equal(reloaded.between(t0, t1)[0].tt, expected)
+
+
+def test_next_after(eph, ts, catalog):
+    t = ts.utc(dt.date.today().year, 1, 1)
+    time, kind, details = catalog.next_after(t)
+    expected_t, expected_y, expected_details = eclipselib.lunar_eclipses(t, ts.tt_jd(t.tt + 365.25), eph)
+    assert time.tt == pytest.approx(expected_t.tt[0], abs=5 * SECOND)
+    assert kind == expected_y[0]
+    assert set(details) == set(expected_details)
+    assert catalog.next_after(time)[0].tt > time.tt + 1
+
+
+def test_next_after_end_of_ephemeris(eph, ts, catalog):
+    # Pas d'éclipse dans les derniers jours couverts : None, sans sortir de l'éphéméride
+    end = catalog._span()[1] - EDGE_DAYS
+    assert catalog.next_after(ts.tt_jd(end - 1)) is None
+    assert catalog.next_after(ts.tt_jd(end + 1)) is None
@@ -0,0 +1,32 @@
+import os
+import sys
+import threading
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'scripts'))
+
+from astro.event_cache import EventCache  # noqa: E402
+
+KEY = ('sunrise_sunset', 'sun', '49.638600,-1.616300,0.0', 'sha1', 2461000.5, 2461002.5)
+
+
+def test_read_from_another_thread(tmp_path):
+    cache = EventCache(str(tmp_path / 'events.sqlite'))
+    cache.put(KEY, {'tt': [2461001.0], 'events': [1]})
+
+    results, errors = [], []
+
+    def read():
+        try:
+            results.append(cache.get(KEY))
+        except Exception as e:
+            errors.append(e)
+
+    threads = [threading.Thread(target=read) for _ in range(2)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert errors == []
+    assert results == [{'tt': [2461001.0], 'events': [1]}] * 2
+    assert cache.get(KEY) == {'tt': [2461001.0], 'events': [1]}
@@ -0,0 +1,61 @@
+import datetime as dt
+
+import numpy as np
+import pytest
+from skyfield.magnitudelib import planetary_magnitude
+
+from astro import magnitudes
+from astro.planet_batch import PLANETS
+
+NAMES = ['mercury', 'venus', 'mars', 'jupiter', 'saturn', 'uranus', 'neptune']
+
+
+@pytest.fixture(scope='module')
+def t(ts):
+    year = dt.date.today().year
+    return ts.tt_jd(np.linspace(ts.utc(year, 1, 1).tt, ts.utc(year + 3, 1, 1).tt, 200))
+
+
+@pytest.fixture(scope='module')
+def astrometric(eph, t):
+    return [eph['earth'].at(t).observe(eph[PLANETS[name]]) for name in NAMES]
+
+
+def test_models_same_as_skyfield(t, astrometric):
+    # Même géométrie que Skyfield, qui place le Soleil au barycentre
+    observer_to_planet = np.stack([position.position.au for position in astrometric])
+    sun_to_planet = observer_to_planet + np.stack([position.center_barycentric.position.au
+                                                   for position in astrometric])
+    result = magnitudes.magnitudes(NAMES, sun_to_planet, observer_to_planet, t.J)
+    for i, position in enumerate(astrometric):
+        assert np.allclose(result['magnitude'][i], planetary_magnitude(position), rtol=0, atol=1e-6)
+
+
+def test_photometry(eph, t, astrometric):
+    result = magnitudes.photometry(NAMES, t)
+    assert result['magnitude'].shape == (len(NAMES),) + t.shape
+    for i, (name, position) in enumerate(zip(NAMES, astrometric)):
+        # Avec le vrai Soleil, écart surtout sensible pour Mercure
+        assert np.abs(result['magnitude'][i] - planetary_magnitude(position)).max() < 0.1
+        illumination = position.apparent().fraction_illuminated(eph['sun'])
+        assert np.allclose(result['illumination'][i], illumination, rtol=0, atol=1e-4)
+        radius_au = magnitudes.EQUATORIAL_RADIUS_KM[name] / magnitudes.KM_PER_AU
+        diameter = 2 * radius_au / position.distance().au * magnitudes.RADIAN_ARCSEC
+        assert np.allclose(result['angular_diameter'][i], diameter, rtol=1e-6)
+    assert np.all(np.isfinite(result['surface_brightness']))
+
+
+def test_scalar_time_and_pluto(ts):
+    result = magnitudes.photometry(['pluto'], ts.utc(dt.date.today().year, 7, 1))
+    assert result['magnitude'].shape == (1,)
+    assert 14 < result['magnitude'][0] < 15
+
+
+def test_saturn_beyond_phase_curve():
+    # Angle de phase de 10°, hors de la courbe de Saturne
+    sun_to_planet = np.array([[[9.5], [0.0], [0.0]]])
+    angle = np.radians(10)
+    observer_to_planet = 8.5 * np.array([[[np.cos(angle)], [np.sin(angle)], [0.0]]])
+    result = magnitudes.magnitudes(['saturn'], sun_to_planet, observer_to_planet, np.array([2026.0]))
+    assert result['phase_angle'][0, 0] == pytest.approx(10)
+    assert np.isnan(result['magnitude'][0, 0])
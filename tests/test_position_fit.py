@@ -0,0 +1,65 @@
+import datetime as dt
+
+import numpy as np
+import pytest
+
+from astro import position_fit, resources
+
+
+@pytest.fixture
+def cache(eph, ts, tmp_path):
+    return position_fit.PositionCache(eph, resources.location(), ts, 'test', folder=str(tmp_path))
+
+
+@pytest.mark.parametrize('body', ['sun', 'moon', 'mars', 'jupiter barycenter'])
+def test_against_skyfield(eph, ts, cache, body):
+    # Deux journées entières, chacune avec ses propres ajustements
+    t = ts.tt_jd(ts.utc(dt.date.today().year, 3, 1).tt + np.linspace(0, 2, 400))
+    exact = resources.observer().at(t).observe(eph[body]).apparent().position.au
+    fitted = cache.apparent(body, t).position.au
+    error = np.linalg.norm(fitted - exact, axis=0) / np.linalg.norm(exact, axis=0)
+    assert error.max() / position_fit.ARCSEC < 0.0004
+
+
+def test_altaz_scalar(eph, ts, cache):
+    t = ts.utc(dt.date.today().year, 3, 1, 21, 30)
+    alt, az, distance = resources.observer().at(t).observe(eph['moon']).apparent().altaz()
+    fit_alt, fit_az, fit_distance = cache.altaz('moon', t)
+    assert abs(fit_alt.degrees - alt.degrees) * 3600 < 0.0004
+    assert abs(fit_az.degrees - az.degrees) * 3600 < 0.0004
+    assert fit_distance.au == pytest.approx(distance.au, rel=1e-9)
+
+
+def test_fits_reused_from_file(eph, ts, cache, tmp_path, monkeypatch):
+    t = ts.utc(dt.date.today().year, 3, 1, 12)
+    expected = cache.apparent('moon', t).position.au
+    assert len(list(tmp_path.glob('position_fits_*.npz'))) == 1
+
+    def build(*args, **kwargs):
+        raise AssertionError('fit rebuilt')
+    monkeypatch.setattr(position_fit.PositionFit, 'build', build)
+    reloaded = position_fit.PositionCache(eph, resources.location(), ts, 'test', folder=str(tmp_path))
+    assert np.array_equal(reloaded.apparent('moon', t).position.au, expected)
+
+
+def test_other_key_refits(eph, ts, cache, tmp_path):
+    t = ts.utc(dt.date.today().year, 3, 1, 12)
+    day = float(np.floor(t.tt - 0.5) + 0.5)
+    cache.fit('sun', day)
+    assert cache._load_day(day)
+    other = position_fit.PositionCache(eph, resources.location(), ts, 'other', folder=str(tmp_path))
+    assert other._load_day(day) == {}
+
+
+def test_build_meets_tolerance():
+    # Mouvement circulaire rapide : la journée doit être découpée davantage
+    def position_au(tt):
+        angle = 40 * np.pi * tt
+        return np.stack([np.cos(angle), np.sin(angle), 0.1 * np.ones_like(tt)])
+    fit = position_fit.PositionFit.build(position_au, 2460000.5)
+    assert fit.coefficients.shape[2] > position_fit.SEGMENTS
+    assert fit.error_arcsec < position_fit.TOLERANCE_ARCSEC
+    tt = np.linspace(2460000.5, 2460001.5, 1000, endpoint=False)
+    exact = position_au(tt)
+    error = np.linalg.norm(fit.position_au(tt) - exact, axis=0) / np.linalg.norm(exact, axis=0)
+    assert error.max() / position_fit.ARCSEC < position_fit.TOLERANCE_ARCSEC
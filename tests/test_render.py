@@ -0,0 +1,67 @@
+from astro import render
+
+
+class FakeMessage:
+
+    def __init__(self, client):
+        self.client = client
+
+    def wait_for_publish(self, timeout=None):
+        self.client.delivered += 1
+
+
+class FakeClient:
+    """Stands for a paho-mqtt client: keeps the messages instead of sending them."""
+
+    def __init__(self):
+        self.messages = {}
+        self.delivered = 0
+
+    def publish(self, topic, payload, retain=False):
+        self.messages[topic] = payload
+        return FakeMessage(self)
+
+
+def test_mqtt_sink_flushed_after_render(eph, ts):
+    sink = render.MqttSink(FakeClient())
+    sent = render.render_all(ts.utc(2026, 10, 17, 12), kinds=('moon',), sinks=[sink], force=True,
+                             backend='raster')
+    assert sent == ['moon_phase.png']
+    assert sink.pending == []
+    assert sink.client.delivered == 1
+    assert sink.client.messages['astronomy/images/moon_phase'].startswith(b'\x89PNG')
+
+
+def test_file_sink_creates_folder(tmp_path):
+    sink = render.FileSink(str(tmp_path / 'images' / 'new'))
+    sink.write('moon_phase.png', b'png')
+    sink.flush()
+    assert (tmp_path / 'images' / 'new' / 'moon_phase.png').read_bytes() == b'png'
+    assert [p.name for p in (tmp_path / 'images' / 'new').iterdir()] == ['moon_phase.png']
+
+
+def test_unchanged_images_skipped(eph, ts, tmp_path):
+    t = ts.utc(2026, 10, 17, 12)
+    sink = render.FileSink(str(tmp_path))
+    first = render.render_all(t, kinds=('phases', 'moon'), sinks=[sink])
+    assert 'moon_phase.png' in first and 'mars_phase.png' in first
+    assert render.render_all(t, kinds=('phases', 'moon'), sinks=[sink]) == []
+
+    # Fichier supprimé, heure de la Lune changée ou autre dessin : seules ces images sont refaites
+    (tmp_path / 'mars_phase.png').unlink()
+    assert render.render_all(t, kinds=('phases', 'moon'), sinks=[sink]) == ['mars_phase.png']
+    assert render.render_all(ts.utc(2026, 10, 17, 12, 1), kinds=('moon',), sinks=[sink]) == ['moon_phase.png']
+    assert render.render_all(t, kinds=('phases',), sinks=[sink], backend='atlas') == \
+        [name for name in first if name != 'moon_phase.png']
+
+
+def test_image_hashes_saved(tmp_path):
+    path = str(tmp_path / 'image_hashes.json')
+    hashes = render.ImageHashes(path)
+    assert hashes.changed('moon_phase.png', (1, 'a'))
+    hashes.update('moon_phase.png', (1, 'a'))
+    hashes.save()
+    reloaded = render.ImageHashes(path)
+    assert not reloaded.changed('moon_phase.png', (1, 'a'))
+    assert reloaded.changed('moon_phase.png', (1, 'b'))
+    assert [p.name for p in tmp_path.iterdir()] == ['image_hashes.json']
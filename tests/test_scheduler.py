@@ -0,0 +1,79 @@
+import datetime as dt
+
+import astronomy
+import pytest
+
+from astro import resources
+from astro.scheduler import HORIZON_ALTITUDE, EventScheduler
+
+BODIES = [astronomy.Body.Sun, astronomy.Body.Moon, astronomy.Body.Mars]
+SECOND = 1 / 86400
+
+
+@pytest.fixture
+def observer():
+    return resources.astronomy_observer()
+
+
+def dates(count, step_minutes=17):
+    """Dates of a process ticking every few minutes, over a few days."""
+    start = astronomy.Time.Make(dt.date.today().year, 4, 1, 0, 0, 0)
+    return [start.AddDays(k * step_minutes / 1440) for k in range(count)]
+
+
+@pytest.mark.parametrize('body', BODIES)
+def test_rise_set_same_as_search(observer, body):
+    scheduler = EventScheduler()
+    for date in dates(200):
+        for direction in (astronomy.Direction.Rise, astronomy.Direction.Set):
+            expected = astronomy.SearchRiseSet(body, observer, direction, date, 1.0)
+            event = scheduler.rise_set(body, observer, direction, date)
+            if expected is None:
+                assert event is None
+            else:
+                assert event.ut == pytest.approx(expected.ut, abs=SECOND)
+
+
+def test_transit_same_as_search(observer):
+    scheduler = EventScheduler()
+    for date in dates(200):
+        expected = astronomy.SearchHourAngle(astronomy.Body.Moon, observer, 0.0, date).time
+        assert scheduler.transit(astronomy.Body.Moon, observer, date).ut == pytest.approx(expected.ut, abs=SECOND)
+
+
+def test_search_once_until_event(observer, monkeypatch):
+    scheduler = EventScheduler()
+    calls = []
+    search = astronomy.SearchRiseSet
+
+    def counted(*args):
+        calls.append(args)
+        return search(*args)
+    monkeypatch.setattr(astronomy, 'SearchRiseSet', counted)
+    date = astronomy.Time.Make(dt.date.today().year, 4, 1, 0, 0, 0)
+    event = scheduler.rise(astronomy.Body.Sun, observer, date)
+    for k in range(1, 60):
+        assert scheduler.rise(astronomy.Body.Sun, observer, date.AddDays(k / 1440)).ut == event.ut
+    assert len(calls) == 1
+    # Une fois l'événement passé, le suivant est cherché
+    assert scheduler.rise(astronomy.Body.Sun, observer, event.AddDays(1 / 1440)).ut > event.ut + 0.9
+    assert len(calls) == 2
+    # Un autre observateur vide le cache
+    scheduler.rise(astronomy.Body.Sun, astronomy.Observer(0.0, 0.0, 0.0), date)
+    assert len(calls) == 3
+
+
+@pytest.mark.parametrize('body', BODIES)
+def test_horizon_crossing(observer, body):
+    scheduler = EventScheduler()
+    date = astronomy.Time.Make(dt.date.today().year, 4, 1, 0, 0, 0)
+    for _ in range(4):
+        event, state = scheduler.horizon_crossing(body, observer, date)
+        # Le corps est levé juste après un lever, couché juste après un coucher
+        for offset, expected in ((-1, 'OFF' if state == 'ON' else 'ON'), (1, state)):
+            t = event.AddDays(offset * SECOND)
+            equatorial = astronomy.Equator(body, t, observer, True, True)
+            horizon = astronomy.Horizon(t, observer, equatorial.ra, equatorial.dec, astronomy.Refraction.Airless)
+            assert ('ON' if horizon.altitude > HORIZON_ALTITUDE else 'OFF') == expected
+            assert scheduler.is_up(body, observer, t) == expected
+        date = event.AddDays(SECOND)
@@ -0,0 +1,50 @@
+import datetime as dt
+
+import numpy as np
+import pytest
+
+from astro import vsop
+
+NAMES = ['mercury', 'venus', 'mars', 'jupiter', 'saturn', 'uranus', 'neptune']
+SKYFIELD_NAMES = {'mercury': 'mercury', 'venus': 'venus', 'mars': 'mars'}
+
+
+def angle_arcsec(a, b):
+    cos_angle = np.sum(a * b, axis=1) / np.linalg.norm(a, axis=1) / np.linalg.norm(b, axis=1)
+    return np.degrees(np.arccos(np.clip(cos_angle, -1, 1))) * 3600
+
+
+@pytest.fixture(scope='module')
+def tt(ts):
+    return np.linspace(ts.utc(dt.date.today().year, 1, 1).tt, ts.utc(dt.date.today().year + 3, 1, 1).tt, 300)
+
+
+def test_against_de421(eph, ts, tt):
+    t = ts.tt_jd(tt)
+    reference = np.stack([eph['earth'].at(t).observe(eph[SKYFIELD_NAMES.get(name, name + ' barycenter')])
+                          .position.au for name in NAMES])
+    assert angle_arcsec(vsop.Series().geocentric(NAMES, tt), reference).max() < 25
+
+
+@pytest.mark.parametrize('accuracy', [10, 60, 300])
+def test_truncation_within_accuracy(tt, accuracy):
+    full = vsop.series()
+    truncated = vsop.Series(accuracy)
+    assert len(truncated) < len(full)
+    error = angle_arcsec(truncated.geocentric(NAMES, tt), full.geocentric(NAMES, tt))
+    assert error.max() < accuracy
+
+
+def test_fewer_terms_for_lower_accuracy():
+    counts = [len(vsop.Series(accuracy)) for accuracy in (0, 10, 60, 300, 1200)]
+    assert counts == sorted(counts, reverse=True)
+    assert vsop.series(0.0) is vsop.series(0.0)
+
+
+def test_per_planet_dates(tt):
+    s = vsop.series()
+    rows = np.stack([tt, tt + 10.0])
+    together = s.heliocentric(['mars', 'venus'], rows, per_planet=True)
+    assert np.allclose(together[0], s.heliocentric(['mars'], tt)[0], rtol=0, atol=1e-12)
+    assert np.allclose(together[1], s.heliocentric(['venus'], tt + 10.0)[0], rtol=0, atol=1e-12)
+    assert s.heliocentric(['earth'], 2460000.5).shape == (1, 3)